@@ -0,0 +1,75 @@
+''' Picks the highest password hashing cost that fits a latency budget on this host.
+
+Run from backend/: python -m auth.calibrate --hasher bcrypt --target-ms 250
+The printed values go to BCRYPT_ROUNDS or ARGON2_TIME_COST/ARGON2_MEMORY_COST in .env.
+'''
+import argparse
+import statistics
+
+from time import perf_counter
+
+from .hashing import BcryptHasher, Argon2Hasher, PasswordHasher
+
+
+PASSWORD = 'calibration_password_1!'
+
+def measure_ms(hasher: PasswordHasher, samples: int) -> float:
+    timings = []
+
+    for _ in range(samples):
+        start = perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append((perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> dict:
+    best = {'BCRYPT_ROUNDS': 4}
+
+    for rounds in range(4, 20):
+        elapsed = measure_ms(BcryptHasher(rounds), samples)
+        print(f'bcrypt rounds={rounds}: {elapsed:.1f} ms')
+
+        if elapsed > target_ms:
+            break
+
+        best = {'BCRYPT_ROUNDS': rounds}
+
+    return best
+
+def calibrate_argon2(target_ms: float, samples: int, memory_cost: int, parallelism: int) -> dict:
+    best = {'ARGON2_TIME_COST': 1, 'ARGON2_MEMORY_COST': memory_cost, 'ARGON2_PARALLELISM': parallelism}
+
+    for time_cost in range(1, 21):
+        elapsed = measure_ms(Argon2Hasher(time_cost, memory_cost, parallelism), samples)
+        print(f'argon2id time_cost={time_cost} memory_cost={memory_cost}: {elapsed:.1f} ms')
+
+        if elapsed > target_ms:
+            break
+
+        best['ARGON2_TIME_COST'] = time_cost
+
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hasher', choices=['bcrypt', 'argon2id'], default='bcrypt')
+    parser.add_argument('--target-ms', type=float, default=250.0)
+    parser.add_argument('--samples', type=int, default=3)
+    parser.add_argument('--argon2-memory-cost', type=int, default=65536)
+    parser.add_argument('--argon2-parallelism', type=int, default=4)
+    args = parser.parse_args()
+
+    if args.hasher == 'argon2id':
+        best = calibrate_argon2(args.target_ms, args.samples, args.argon2_memory_cost, args.argon2_parallelism)
+    else:
+        best = calibrate_bcrypt(args.target_ms, args.samples)
+
+    print()
+    print(f'PASSWORD_HASHER={args.hasher}')
+
+    for key, value in best.items():
+        print(f'{key}={value}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import asyncio
+import bcrypt
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from time import perf_counter
+from functools import cache
+from typing import Any, Callable, Protocol
+
+from argon2 import PasswordHasher as Argon2PasswordHasher, Type
+from argon2.exceptions import VerificationError, InvalidHashError
+
+from src.config import settings
+from src.metrics import Counter, Histogram
+
+from .exceptions import PASSWORD_HASHING_UNAVAILABLE
+
+
+password_hashing_seconds = Histogram('password_hashing_seconds', 'Time spent hashing or verifying a password, including queue wait')
+password_hashing_rejected_total = Counter('password_hashing_rejected_total', 'Password hashing calls rejected because the queue was full')
+
+class PasswordHasher(Protocol):
+    prefixes: tuple[str, ...]
+
+    def hash(self, password: str) -> str: ...
+
+    def verify(self, password: str, hashed_password: str) -> bool: ...
+
+    def needs_rehash(self, hashed_password: str) -> bool: ...
+
+class BcryptHasher:
+    prefixes = ('$2a$', '$2b$', '$2y$')
+
+    def __init__(self, rounds: int) -> None:
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=self.rounds)).decode()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return int(hashed_password.split('$')[2]) != self.rounds
+
+class Argon2Hasher:
+    prefixes = ('$argon2id$',)
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int) -> None:
+        self._hasher = Argon2PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism, type=Type.ID)
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password)
+
+@cache
+def get_password_hasher(name: str | None = None) -> PasswordHasher:
+    name = name or settings.PASSWORD_HASHER
+
+    if name == 'argon2id':
+        return Argon2Hasher(settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM)
+
+    return BcryptHasher(settings.BCRYPT_ROUNDS)
+
+def identify_password_hasher(hashed_password: str) -> PasswordHasher | None:
+    for name in ('bcrypt', 'argon2id'):
+        hasher = get_password_hasher(name)
+
+        if hashed_password.startswith(hasher.prefixes):
+            return hasher
+
+    return None
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    hasher = get_password_hasher()
+
+    if not hashed_password.startswith(hasher.prefixes):
+        return True
+
+    return hasher.needs_rehash(hashed_password)
+
+_executor: Executor | None = None
+_in_flight = 0
+
+def get_hashing_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        if settings.PASSWORD_HASHING_EXECUTOR == 'process':
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASHING_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHING_WORKERS, thread_name_prefix='password-hashing')
+
+    return _executor
+
+def warm_hashing_executor() -> None:
+    ''' Starts every worker now; a process pool otherwise forks on the first login '''
+    executor = get_hashing_executor()
+
+    for future in [executor.submit(abs, 0) for _ in range(settings.PASSWORD_HASHING_WORKERS)]:
+        future.result()
+
+def shutdown_hashing_executor() -> None:
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+async def run_password_hashing(func: Callable[..., Any], *args: Any) -> Any:
+    global _in_flight
+
+    if _in_flight >= settings.PASSWORD_HASHING_WORKERS + settings.PASSWORD_HASHING_QUEUE_SIZE:
+        password_hashing_rejected_total.inc()
+        raise PASSWORD_HASHING_UNAVAILABLE
+
+    _in_flight += 1
+    start = perf_counter()
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_hashing_executor(), func, *args)
+    finally:
+        _in_flight -= 1
+        password_hashing_seconds.observe(perf_counter() - start)
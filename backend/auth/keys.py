@@ -0,0 +1,149 @@
+''' Asymmetric JWT signing keys with kid-based rotation.
+
+Keys live in JWT_KEYS_DIR as <kid>.pem files holding a private key, or a public key
+for a retired kid that only needs to verify tokens until they expire. JWT_ACTIVE_KID
+picks the signing key. Without JWT_KEYS_DIR tokens are signed with SECRET_KEY and
+ALGORITHM as before.
+
+Generate a key from backend/: python -m auth.keys --algorithm EdDSA --kid 2026-10
+'''
+import argparse
+import hashlib
+import jwt
+import orjson
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from src.config import settings
+
+
+@dataclass(slots=True, frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any | None = None
+
+    @property
+    def jwk(self) -> dict:
+        algorithm = OKPAlgorithm if self.algorithm == 'EdDSA' else ECAlgorithm
+        jwk = algorithm.to_jwk(self.public_key, as_dict=True)
+        jwk.update({'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'})
+
+        return jwk
+
+@dataclass(slots=True, frozen=True)
+class KeyRing:
+    ''' Parsed key objects by kid, so PEMs are read once per process and not per request '''
+    keys: dict[str, SigningKey]
+    active: SigningKey | None
+    jwks: bytes
+    jwks_etag: str
+
+def get_key_algorithm(key: Any) -> str:
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return 'EdDSA'
+
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and isinstance(key.curve, ec.SECP256R1):
+        return 'ES256'
+
+    raise ValueError(f'Unsupported JWT key type {type(key).__name__}, expected Ed25519 or EC P-256')
+
+def load_signing_key(path: Path) -> SigningKey:
+    data = path.read_bytes()
+
+    try:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    except ValueError:
+        private_key = None
+        public_key = serialization.load_pem_public_key(data)
+
+    return SigningKey(path.stem, get_key_algorithm(public_key), public_key, private_key)
+
+@cache
+def get_key_ring() -> KeyRing:
+    keys = {}
+
+    if settings.JWT_KEYS_DIR:
+        for path in sorted(Path(settings.JWT_KEYS_DIR).glob('*.pem')):
+            key = load_signing_key(path)
+            keys[key.kid] = key
+
+    active = None
+
+    if settings.JWT_ACTIVE_KID:
+        active = keys.get(settings.JWT_ACTIVE_KID)
+
+        if active is None or active.private_key is None:
+            raise ValueError(f'No private key for JWT_ACTIVE_KID={settings.JWT_ACTIVE_KID} in JWT_KEYS_DIR')
+
+    jwks = orjson.dumps({'keys': [key.jwk for key in keys.values()]})
+
+    return KeyRing(keys, active, jwks, hashlib.blake2b(jwks, digest_size=16).hexdigest())
+
+def encode_jwt(payload: dict) -> str:
+    active = get_key_ring().active
+
+    if active is None:
+        return jwt.encode(payload=payload, key=settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    return jwt.encode(payload=payload, key=active.private_key, algorithm=active.algorithm, headers={'kid': active.kid})
+
+def decode_jwt(token: str) -> dict:
+    ''' Raises jwt.InvalidTokenError subclasses, including for an unknown kid '''
+    kid = jwt.get_unverified_header(token).get('kid')
+
+    if kid is None:
+        if not settings.JWT_ACCEPT_LEGACY_TOKENS:
+            raise jwt.InvalidTokenError('Token has no kid')
+
+        return jwt.decode(jwt=token, key=settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    key = get_key_ring().keys.get(kid)
+
+    if key is None:
+        raise jwt.InvalidTokenError(f'Unknown kid {kid}')
+
+    return jwt.decode(jwt=token, key=key.public_key, algorithms=[key.algorithm])
+
+def generate_private_key(algorithm: str) -> Any:
+    if algorithm == 'EdDSA':
+        return ed25519.Ed25519PrivateKey.generate()
+
+    return ec.generate_private_key(ec.SECP256R1())
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--algorithm', choices=['EdDSA', 'ES256'], default='EdDSA')
+    parser.add_argument('--kid', required=True)
+    parser.add_argument('--keys-dir', default=settings.JWT_KEYS_DIR)
+    args = parser.parse_args()
+
+    if not args.keys_dir:
+        parser.error('--keys-dir or JWT_KEYS_DIR is required')
+
+    path = Path(args.keys_dir) / f'{args.kid}.pem'
+
+    if path.exists():
+        parser.error(f'{path} already exists')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(generate_private_key(args.algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ))
+    path.chmod(0o600)
+
+    print(f'Wrote {path}, deploy it to every instance, then set JWT_ACTIVE_KID={args.kid}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+''' Password policy checked at registration, configured through the PASSWORD_* settings.
+
+Build the optional breached-password filter from backend/:
+python -m auth.password_policy leaked.txt breached.bloom [--error-rate 0.001]
+The input holds one leaked password per line; point PASSWORD_BREACHED_FILTER_PATH at the output.
+'''
+import argparse
+import string
+
+from dataclasses import dataclass, field
+from functools import cache
+
+from src.config import settings
+from src.bloom import BloomFilter
+
+
+ASCII_LETTERS = frozenset(string.ascii_letters)
+ASCII_DIGITS = frozenset(string.digits)
+
+BREACHED_PASSWORD_MESSAGE = 'Пароль найден в утечках данных, выберите другой!'
+
+@dataclass(slots=True, frozen=True)
+class PasswordPolicy:
+    ''' Character classes are checked on the set of distinct characters built in one pass over the password '''
+    min_length: int
+    require_letter: bool
+    require_digit: bool
+    require_special: bool
+    special_characters: frozenset[str]
+    breached_filter: BloomFilter | None = None
+    allowed_characters: frozenset[str] = field(init=False)
+    message: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'allowed_characters', ASCII_LETTERS | ASCII_DIGITS | self.special_characters)
+        object.__setattr__(self, 'message', self.build_message())
+
+    def build_message(self) -> str:
+        classes = [
+            label for label, required in (
+                ('1 букву', self.require_letter),
+                ('1 цифру', self.require_digit),
+                ('1 специальный символ', self.require_special),
+            ) if required
+        ]
+        length = f'быть не менее {self.min_length} символов'
+
+        if not classes:
+            return f'Пароль должен {length}!'
+
+        return f'Пароль должен содержать минимум {", ".join(classes[:-1])}{" и " if len(classes) > 1 else ""}{classes[-1]} и {length}!'
+
+    def check(self, password: str) -> str | None:
+        ''' Error message for a rejected password, None if it is accepted '''
+        if len(password) < self.min_length:
+            return self.message
+
+        characters = frozenset(password)
+        unknown = characters - self.allowed_characters
+
+        # Non-ASCII decimal digits are accepted as digits, like \d in the previous regex
+        if unknown and not ''.join(unknown).isdecimal():
+            return self.message
+
+        if self.require_letter and characters.isdisjoint(ASCII_LETTERS):
+            return self.message
+
+        if self.require_digit and characters.isdisjoint(ASCII_DIGITS) and not unknown:
+            return self.message
+
+        if self.require_special and characters.isdisjoint(self.special_characters):
+            return self.message
+
+        if self.breached_filter is not None and password in self.breached_filter:
+            return BREACHED_PASSWORD_MESSAGE
+
+        return None
+
+@cache
+def get_password_policy() -> PasswordPolicy:
+    breached_filter = None
+
+    if settings.PASSWORD_BREACHED_FILTER_PATH:
+        breached_filter = BloomFilter.load(settings.PASSWORD_BREACHED_FILTER_PATH)
+
+    return PasswordPolicy(
+        min_length=settings.PASSWORD_MIN_LENGTH,
+        require_letter=settings.PASSWORD_REQUIRE_LETTER,
+        require_digit=settings.PASSWORD_REQUIRE_DIGIT,
+        require_special=settings.PASSWORD_REQUIRE_SPECIAL,
+        special_characters=frozenset(settings.PASSWORD_SPECIAL_CHARACTERS),
+        breached_filter=breached_filter,
+    )
+
+def build_breached_filter(source: str, output: str, error_rate: float) -> int:
+    with open(source, encoding='utf-8', errors='ignore') as file:
+        capacity = sum(1 for line in file if line.rstrip('\r\n'))
+
+    bloom = BloomFilter.for_capacity(max(capacity, 1), error_rate)
+
+    with open(source, encoding='utf-8', errors='ignore') as file:
+        for line in file:
+            password = line.rstrip('\r\n')
+
+            if password:
+                bloom.add(password)
+
+    bloom.save(output)
+
+    return capacity
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source')
+    parser.add_argument('output')
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    args = parser.parse_args()
+
+    count = build_breached_filter(args.source, args.output, args.error_rate)
+
+    print(f'Added {count} passwords to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+import orjson
+
+from fastapi import Response, status
+from fastapi.responses import ORJSONResponse
+
+from .schemas import AccessTokenResponseSchema
+
+
+REGISTRATION_SUCCESS = orjson.dumps({'message': 'Пользователь успешно зарегестрирован в системе!'})
+
+LOGOUT_SUCCESS = orjson.dumps({'message': 'Вы успешно вышли из системы!'})
+
+EMAIL_ALREADY_VERIFIED = orjson.dumps({'message': 'Учетная запись уже активирована!'})
+
+EMAIL_VERIFIED = orjson.dumps({'message': 'Учетная запись успешно активирована!'})
+
+def message_response(body: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+    return Response(content=body, status_code=status_code, media_type='application/json')
+
+def access_token_response(access_token: str) -> ORJSONResponse:
+    ''' Built from trusted values, so the schema is constructed without re-validation '''
+    return ORJSONResponse(AccessTokenResponseSchema.model_construct(access_token=access_token).model_dump())
\ No newline at end of file
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, Response, Request, status
+from fastapi import APIRouter, Depends, Request, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from redis.asyncio import Redis
 
-from src.dependencies import get_db, get_redis
+from src.config import settings
+from src.dependencies import get_db, get_primary_db, get_redis, RateLimiter, client_ip_key, email_key
 
 from .schemas import UserRegistrationSchema, UserLoginSchema, AccessTokenResponseSchema
-from .services import registration, authentication, logout, refresh, verify_email
+from .services import registration, authentication, logout, refresh, verify_email, get_jwks
 
 
 auth_router = APIRouter(
@@ -15,22 +16,35 @@ auth_router = APIRouter(
     tags=['Auth'],
 )
 
-@auth_router.post('/registration', status_code=status.HTTP_201_CREATED)
-async def registration_user(user_data: UserRegistrationSchema, db: AsyncSession = Depends(get_db)):
+registration_rate_limits = [
+    Depends(RateLimiter('registration:ip', settings.RATE_LIMIT_REGISTRATION_PER_IP, settings.RATE_LIMIT_WINDOW_SECONDS, client_ip_key)),
+]
+
+login_rate_limits = [
+    Depends(RateLimiter('login:ip', settings.RATE_LIMIT_LOGIN_PER_IP, settings.RATE_LIMIT_WINDOW_SECONDS, client_ip_key)),
+    Depends(RateLimiter('login:email', settings.RATE_LIMIT_LOGIN_PER_EMAIL, settings.RATE_LIMIT_WINDOW_SECONDS, email_key)),
+]
+
+@auth_router.post('/registration', status_code=status.HTTP_201_CREATED, dependencies=registration_rate_limits)
+async def registration_user(user_data: UserRegistrationSchema, db: AsyncSession = Depends(get_primary_db)):
     return await registration(user_data, db)
 
-@auth_router.post('/login', response_model=AccessTokenResponseSchema)
-async def login_user(user_data: UserLoginSchema, response: Response, db: AsyncSession = Depends(get_db)):
-    return await authentication(user_data, response, db)
+@auth_router.post('/login', response_model=AccessTokenResponseSchema, dependencies=login_rate_limits)
+async def login_user(user_data: UserLoginSchema, db: AsyncSession = Depends(get_db)):
+    return await authentication(user_data, db)
 
 @auth_router.post('/logout')
-async def logout_user(request: Request, response: Response, redis: Redis = Depends(get_redis)):
-    return await logout(request, response, redis)
+async def logout_user(request: Request, redis: Redis = Depends(get_redis)):
+    return await logout(request, redis)
 
 @auth_router.post('/refresh', response_model=AccessTokenResponseSchema)
-async def refresh_token(request: Request, response: Response, db: AsyncSession = Depends(get_db), redis: Redis = Depends(get_redis)):
-    return await refresh(request, response, db, redis)
+async def refresh_token(request: Request, db: AsyncSession = Depends(get_db), redis: Redis = Depends(get_redis)):
+    return await refresh(request, db, redis)
 
 @auth_router.get('/email-verify')
-async def verify_email_user(token: str, db: AsyncSession = Depends(get_db)):
-    return await verify_email(token, db)
\ No newline at end of file
+async def verify_email_user(token: str, db: AsyncSession = Depends(get_primary_db), redis: Redis = Depends(get_redis)):
+    return await verify_email(token, db, redis)
+
+@auth_router.get('/.well-known/jwks.json')
+async def jwks(request: Request):
+    return await get_jwks(request)
\ No newline at end of file
@@ -1,7 +1,7 @@
-import re
-
 from pydantic import BaseModel, EmailStr, field_validator
 
+from .password_policy import get_password_policy
+
 
 class AccessTokenResponseSchema(BaseModel):
     access_token: str
@@ -14,11 +14,11 @@ class UserRegistrationSchema(BaseModel):
     @field_validator('password')
     @classmethod
     def validate_password(cls, value: str) -> str:
-        REGEX_PASSWORD = r"^(?=.*[A-Za-z])(?=.*\d)(?=.*[@$!%*#?&_])[A-Za-z\d@$!%*#?&_]{8,}$"
+        error = get_password_policy().check(value)
+
+        if error is not None:
+            raise ValueError(error)
 
-        if not re.fullmatch(REGEX_PASSWORD, value):
-            raise ValueError('Пароль должен содержать минимум 1 букву, 1 цифру и 1 специальный символ и быть не менее 8 символов!')
-    
         return value
 
 class UserLoginSchema(BaseModel):
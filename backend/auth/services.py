@@ -1,47 +1,50 @@
-from fastapi import Request, Response
+from fastapi import Request, Response, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from redis.asyncio import Redis
 
-from users.models import UserModel
-
-from .schemas import UserRegistrationSchema, UserLoginSchema, AccessTokenResponseSchema
-from .utils import get_user_by_email, get_user_by_id, hashing_password, verify_password, create_access_token, create_refresh_token, verify_jwt_token, set_token_to_blacklist, is_token_to_blacklist, create_verify_email_message
-from .exceptions import EMAIL_ALREADY_REGISTERED, INCORRECT_LOGIN_OR_PASSWORD, MISSING_JWT_TOKEN, INVALID_JWT_TOKEN, USER_ACCOUNT_IS_INACTIVE, USER_ACCOUNT_IS_MISSING, USER_ACCOUNT_IS_NOT_VERIFY
-from .tasks import send_email_task
+from src.config import settings
 
+from users.cache import get_user_auth, invalidate_user_auth
+from outbox.services import add_outbox_message
+from users.queries import create_user, get_user_credentials_by_email, get_user_auth_by_id, update_user_password, set_user_verified
 
-async def registration(user_data: UserRegistrationSchema, db: AsyncSession) -> None:
-    user = await get_user_by_email(user_data.email, db)
+from .schemas import UserRegistrationSchema, UserLoginSchema
+from .responses import REGISTRATION_SUCCESS, LOGOUT_SUCCESS, EMAIL_ALREADY_VERIFIED, EMAIL_VERIFIED, message_response, access_token_response
+from .utils import hashing_password, verify_password, create_access_token, create_refresh_token, set_auth_cookies, verify_jwt_token, set_token_to_blacklist, revoke_token_once, create_verify_email_link
+from .keys import get_key_ring
+from .exceptions import EMAIL_ALREADY_REGISTERED, INCORRECT_LOGIN_OR_PASSWORD, MISSING_JWT_TOKEN, INVALID_JWT_TOKEN, USER_ACCOUNT_IS_INACTIVE, USER_ACCOUNT_IS_MISSING, USER_ACCOUNT_IS_NOT_VERIFY
+from .hashing import password_needs_rehash
 
-    if user is not None:
-        raise EMAIL_ALREADY_REGISTERED
 
+async def registration(user_data: UserRegistrationSchema, db: AsyncSession) -> Response:
     user_data_dict = user_data.model_dump()
 
-    user_data_dict['password'] = hashing_password(user_data_dict.get('password'))
+    user_data_dict['password'] = await hashing_password(user_data_dict.get('password'))
 
-    new_user = UserModel(**user_data_dict)
+    user_id = await create_user(user_data_dict, db)
 
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    if user_id is None:
+        raise EMAIL_ALREADY_REGISTERED
 
-    message = create_verify_email_message(new_user.id)
+    await add_outbox_message('auth.tasks.send_template_email_task', {
+        'to_email': user_data.email,
+        'subject': "Подтверждение учетной записи",
+        'template_name': "verify_email.html",
+        'context': {'verify_link': create_verify_email_link(user_id)},
+    }, db)
+    await db.commit()
 
-    send_email_task.delay(
-    new_user.email,
-    "Подтверждение учетной записи",
-    message
-    )
+    return message_response(REGISTRATION_SUCCESS, status.HTTP_201_CREATED)
 
-    return {'message': 'Пользователь успешно зарегестрирован в системе!'}
+async def authentication(user_data: UserLoginSchema, db: AsyncSession) -> Response:
+    user = await get_user_credentials_by_email(user_data.email, db)
 
-async def authentication(user_data: UserLoginSchema, response: Response, db: AsyncSession) -> AccessTokenResponseSchema:
-    user = await get_user_by_email(user_data.email, db)
+    # Hand the connection back to the pool before the password check, which takes far longer than the query
+    await db.close()
 
-    if not user or not verify_password(user_data.password, user.password):
+    if not user or not await verify_password(user_data.password, user.password):
         raise INCORRECT_LOGIN_OR_PASSWORD
     
     if not user.is_active:
@@ -49,13 +52,20 @@ async def authentication(user_data: UserLoginSchema, response: Response, db: Asy
     
     if not user.is_verified:
         raise USER_ACCOUNT_IS_NOT_VERIFY
+
+    if password_needs_rehash(user.password):
+        await update_user_password(user.id, await hashing_password(user_data.password), db)
+        await db.commit()
     
-    access_token = create_access_token({'sub': str(user.id), 'role': user.role}, response)
-    create_refresh_token({'sub': str(user.id)}, response)
+    access_token = create_access_token({'sub': str(user.id), 'role': user.role})
+    refresh_token = create_refresh_token({'sub': str(user.id)})
 
-    return AccessTokenResponseSchema(access_token=access_token)
+    response = access_token_response(access_token)
+    set_auth_cookies(response, access_token, refresh_token)
 
-async def logout(request: Request, response: Response, redis: Redis) -> None:
+    return response
+
+async def logout(request: Request, redis: Redis) -> Response:
     refresh_token = request.cookies.get('refresh_token')
 
     if not refresh_token:
@@ -65,24 +75,26 @@ async def logout(request: Request, response: Response, redis: Redis) -> None:
 
     await set_token_to_blacklist(redis, refresh_token, payload)
 
+    response = message_response(LOGOUT_SUCCESS)
     response.delete_cookie(key='access_token')
     response.delete_cookie(key='refresh_token')
 
-    return {'message': 'Вы успешно вышли из системы!'}
+    return response
 
-async def refresh(request: Request, response: Response, db: AsyncSession, redis: Redis) -> AccessTokenResponseSchema:
+async def refresh(request: Request, db: AsyncSession, redis: Redis) -> Response:
     refresh_token = request.cookies.get('refresh_token')
 
     if not refresh_token:
         raise MISSING_JWT_TOKEN
     
-    if await is_token_to_blacklist(redis, refresh_token):
+    payload = verify_jwt_token(refresh_token)
+
+    if not await revoke_token_once(redis, refresh_token, payload):
         raise INVALID_JWT_TOKEN
 
-    payload = verify_jwt_token(refresh_token)
     user_id = int(payload.get('sub'))
 
-    user = await get_user_by_id(user_id, db)
+    user = await get_user_auth(user_id, db, redis)
 
     if not user:
         raise USER_ACCOUNT_IS_MISSING
@@ -90,18 +102,19 @@ async def refresh(request: Request, response: Response, db: AsyncSession, redis:
     if not user.is_active:
         raise USER_ACCOUNT_IS_INACTIVE
 
-    access_token = create_access_token({'sub': str(user_id), 'role': user.role}, response)
-    create_refresh_token({'sub': str(user_id)}, response)
+    access_token = create_access_token({'sub': str(user_id), 'role': user.role})
+    new_refresh_token = create_refresh_token({'sub': str(user_id)})
 
-    await set_token_to_blacklist(redis, refresh_token, payload)
+    response = access_token_response(access_token)
+    set_auth_cookies(response, access_token, new_refresh_token)
 
-    return AccessTokenResponseSchema(access_token=access_token)
+    return response
 
-async def verify_email(token: str, db: AsyncSession) -> None:
+async def verify_email(token: str, db: AsyncSession, redis: Redis) -> Response:
     payload = verify_jwt_token(token)
     user_id = int(payload.get('sub'))
 
-    user = await get_user_by_id(user_id, db)
+    user = await get_user_auth_by_id(user_id, db)
 
     if not user:
         raise USER_ACCOUNT_IS_MISSING
@@ -110,9 +123,22 @@ async def verify_email(token: str, db: AsyncSession) -> None:
         raise USER_ACCOUNT_IS_INACTIVE
 
     if user.is_verified:
-        return {'message': 'Учетная запись уже активирована!'}
+        return message_response(EMAIL_ALREADY_VERIFIED)
     
-    user.is_verified = True
+    await set_user_verified(user_id, db)
     await db.commit()
+    await invalidate_user_auth(user_id, redis)
+
+    return message_response(EMAIL_VERIFIED)
+
+async def get_jwks(request: Request) -> Response:
+    key_ring = get_key_ring()
+    headers = {
+        'Cache-Control': f'public, max-age={settings.JWKS_MAX_AGE_SECONDS}',
+        'ETag': f'"{key_ring.jwks_etag}"',
+    }
+
+    if request.headers.get('if-none-match') == headers['ETag']:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    return {'message': 'Учетная запись успешно активирована!'}
\ No newline at end of file
+    return Response(content=key_ring.jwks, media_type='application/jwk-set+json', headers=headers)
\ No newline at end of file
@@ -1,28 +1,82 @@
-import asyncio
 import aiosmtplib
 
 from email.message import EmailMessage
 
+from celery.signals import worker_process_init, worker_process_shutdown
+
 from src.config import settings
-from src.celery import celery_app
+from src.metrics import Counter
+from src.celery import celery_app, run_async
+from src.smtp import smtp_pool
+from src.templates import precompile_templates, render_template
+
 
+emails_refused_total = Counter('emails_refused_total', 'Emails dropped because the SMTP server refused them permanently')
 
-async def async_send_email(to_email: str, subject: str, body: str) -> None:
+def build_email_message(to_email: str, subject: str, body: str) -> EmailMessage:
     message = EmailMessage()
-    message["From"] = settings.SMTP_USER
+    message["From"] = settings.SMTP_FROM or settings.SMTP_USER
     message["To"] = to_email
     message["Subject"] = subject
     message.add_alternative(body, subtype="html")
 
-    await aiosmtplib.send(
-        message,
-        hostname=settings.SMTP_HOST,
-        port=settings.SMTP_PORT,
-        start_tls=True,
-        username=settings.SMTP_USER,
-        password=settings.SMTP_PASSWORD,
-    )
-
-@celery_app.task
-def send_email_task(to_email: str, subject: str, body: str) -> None:
-    asyncio.run(async_send_email(to_email, subject, body))
\ No newline at end of file
+    return message
+
+def is_permanent_failure(exc: aiosmtplib.SMTPException) -> bool:
+    ''' A 5xx reply fails the same way on every retry; 4xx replies and dropped connections are worth retrying '''
+    if isinstance(exc, aiosmtplib.SMTPRecipientsRefused):
+        return all(error.code >= 500 for error in exc.recipients)
+
+    return isinstance(exc, aiosmtplib.SMTPResponseException) and exc.code >= 500
+
+async def async_send_emails(messages: list[EmailMessage]) -> None:
+    ''' Sends messages over one pooled SMTP session, popping each one once delivered or permanently refused '''
+    async with smtp_pool.connection() as client:
+        while messages:
+            try:
+                await client.send_message(messages[0])
+            except aiosmtplib.SMTPException as exc:
+                if not is_permanent_failure(exc):
+                    raise
+
+                # Skipped rather than retried, so one bad address can't hold back the rest of a batch
+                emails_refused_total.inc()
+
+            messages.pop(0)
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=10)
+def send_email_task(self, to_email: str, subject: str, body: str) -> None:
+    try:
+        run_async(async_send_emails([build_email_message(to_email, subject, body)]))
+    except aiosmtplib.SMTPException as exc:
+        raise self.retry(exc=exc)
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=10)
+def send_template_email_task(self, to_email: str, subject: str, template_name: str, context: dict) -> None:
+    body = render_template(template_name, context)
+
+    try:
+        run_async(async_send_emails([build_email_message(to_email, subject, body)]))
+    except aiosmtplib.SMTPException as exc:
+        raise self.retry(exc=exc)
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=10)
+def send_template_email_batch_task(self, emails: list[dict]) -> None:
+    ''' Takes send_template_email_task kwargs for many emails and delivers them over one SMTP session '''
+    messages = [
+        build_email_message(email['to_email'], email['subject'], render_template(email['template_name'], email['context']))
+        for email in emails
+    ]
+
+    try:
+        run_async(async_send_emails(messages))
+    except aiosmtplib.SMTPException as exc:
+        raise self.retry(args=[emails[len(emails) - len(messages):]], exc=exc)
+
+@worker_process_init.connect
+def warm_templates(**kwargs) -> None:
+    precompile_templates()
+
+@worker_process_shutdown.connect
+def close_smtp_pool(**kwargs) -> None:
+    run_async(smtp_pool.close())
\ No newline at end of file
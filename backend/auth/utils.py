@@ -1,66 +1,91 @@
 import jwt
-import bcrypt
+import asyncio
+import hashlib
 
 from fastapi import Response
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from redis.asyncio import Redis
-
-from jinja2 import Environment, FileSystemLoader
+from redis.exceptions import RedisError
 
 from datetime import datetime, timezone, timedelta
+from uuid import uuid4
 
-from users.models import UserModel
 from src.config import settings
+from src.cache import TTLCache
+from src.metrics import Counter
+from src.instrumentation import timed
 
 from .exceptions import INVALID_JWT_TOKEN, EXPIRED_JWT_TOKEN
+from .keys import encode_jwt, decode_jwt, get_key_ring
+from .hashing import run_password_hashing, get_password_hasher, identify_password_hasher
 
 
-env = Environment(loader=FileSystemLoader("templates"))
+jwt_cache = TTLCache(maxsize=settings.JWT_CACHE_SIZE)
+jwt_cache_hits_total = Counter('jwt_cache_hits_total', 'Verified JWT payloads served from the in-process cache')
+jwt_cache_misses_total = Counter('jwt_cache_misses_total', 'JWT tokens that required a full signature check')
 
-async def get_user_by_email(email: str, db: AsyncSession) -> UserModel | None:
-    user = await db.execute(select(UserModel).where(UserModel.email == email))
+BLACKLIST_CHANNEL = 'blacklist:revoked'
 
-    return user.scalar_one_or_none()
+REVOKE_TOKEN_SCRIPT = '''
+if #KEYS > 1 and redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
 
-async def get_user_by_id(id: int, db: AsyncSession) -> UserModel | None:
-    user = await db.execute(select(UserModel).where(UserModel.id == id))
+if not redis.call('SET', KEYS[1], 1, 'NX', 'EX', ARGV[1]) then
+    return 0
+end
 
-    return user.scalar_one_or_none()
+redis.call('PUBLISH', ARGV[2], ARGV[3])
 
-def hashing_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode(), salt)
+return 1
+'''
 
-    return hashed_password.decode()
+revoked_tokens_cache = TTLCache(maxsize=settings.BLACKLIST_CACHE_SIZE)
+blacklist_cache_hits_total = Counter('blacklist_cache_hits_total', 'Blacklist lookups answered by the in-process cache')
+blacklist_cache_misses_total = Counter('blacklist_cache_misses_total', 'Blacklist lookups that went to Redis')
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+@timed('password_hash')
+async def hashing_password(password: str) -> str:
+    return await run_password_hashing(get_password_hasher().hash, password)
 
-def create_access_token(payload: dict, response: Response) -> str:
-    access_token = create_jwt_token(payload, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
-    set_jwt_cookies(response, 'access_token', access_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+@timed('password_verify')
+async def verify_password(password: str, hashed_password: str) -> bool:
+    hasher = identify_password_hasher(hashed_password)
 
-    return access_token
+    if hasher is None:
+        return False
 
-def create_refresh_token(payload: dict, response: Response) -> str:
-    refresh_token = create_jwt_token(payload, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
-    set_jwt_cookies(response, 'refresh_token', refresh_token, settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60)
+    return await run_password_hashing(hasher.verify, password, hashed_password)
 
-    return refresh_token
+def create_access_token(payload: dict) -> str:
+    return create_jwt_token(payload, timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+
+def create_refresh_token(payload: dict) -> str:
+    # Without a jti, a token rotated within the same second as its predecessor is byte-identical to the revoked one
+    return create_jwt_token(payload | {'jti': uuid4().hex}, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+
+def set_auth_cookies(response: Response, access_token: str, refresh_token: str) -> None:
+    set_jwt_cookies(response, 'access_token', access_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    set_jwt_cookies(response, 'refresh_token', refresh_token, settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60)
 
+@timed('jwt_sign')
 def create_jwt_token(payload: dict, expire_delta: timedelta) -> str:
     to_encode = payload.copy()
     datetime_now = datetime.now(timezone.utc)
     expire = datetime_now + expire_delta
     to_encode.update({'exp': expire, 'iat': datetime_now})
 
-    jwt_token = jwt.encode(payload=to_encode, key=settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    jwt_token = encode_jwt(to_encode)
 
     return jwt_token
 
+def warm_jwt() -> None:
+    ''' Signs and verifies one token so the first request doesn't pay for key and algorithm setup '''
+    get_key_ring()
+    token = create_jwt_token({'sub': '0'}, timedelta(seconds=1))
+    verify_jwt_token(token)
+    jwt_cache.pop(get_token_digest(token))
+
 def set_jwt_cookies(response: Response, key: str, value: str, max_age: int) -> None:
     response.set_cookie(
         key=key,
@@ -71,39 +96,89 @@ def set_jwt_cookies(response: Response, key: str, value: str, max_age: int) -> N
         samesite='strict',
     )
 
+def get_token_digest(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+@timed('jwt_verify')
 def verify_jwt_token(token: str) -> dict:
+    digest = get_token_digest(token)
+    payload = jwt_cache.get(digest)
+
+    if payload is not None:
+        jwt_cache_hits_total.inc()
+        return payload.copy()
+
+    jwt_cache_misses_total.inc()
+
     try:
-        payload = jwt.decode(
-            jwt=token,
-            key=settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_jwt(token)
     except jwt.ExpiredSignatureError:
         raise EXPIRED_JWT_TOKEN
     except jwt.InvalidTokenError:
         raise INVALID_JWT_TOKEN
+
+    if 'exp' in payload:
+        jwt_cache.set(digest, payload.copy(), payload['exp'])
     
     return payload
 
+def mark_token_revoked(digest: str, expire_token: float) -> None:
+    revoked_tokens_cache.set(digest, True, expire_token)
+    jwt_cache.pop(digest)
+
+@timed('blacklist_set')
 async def set_token_to_blacklist(redis: Redis, token: str, payload: dict) -> None:
-    key = f'blacklist:{token}'
+    digest = get_token_digest(token)
     expire_token = payload.get('exp')
     datetime_now = int(datetime.now(timezone.utc).timestamp())
     ttl = expire_token - datetime_now
-    
-    await redis.set(key, 'true', ex=ttl)
 
-async def is_token_to_blacklist(redis: Redis, token: str) -> bool:
-    return await redis.exists(f'blacklist:{token}')
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(f'blacklist:{digest}', 1, ex=ttl)
+        pipe.publish(BLACKLIST_CHANNEL, f'{digest}:{expire_token}')
+        await pipe.execute()
 
-def create_verify_email_message(user_id: int) -> str:
-    verify_token = create_jwt_token(payload={'sub': str(user_id)}, expire_delta=timedelta(minutes=settings.EMAIL_VERIFY_EXPIRE_MINUTES))
-    message = render_verify_email_message_html(verify_token)
+    mark_token_revoked(digest, expire_token)
 
-    return message
+@timed('blacklist_revoke')
+async def revoke_token_once(redis: Redis, token: str, payload: dict) -> bool:
+    digest = get_token_digest(token)
 
-def render_verify_email_message_html(token: str) -> str:
-    template = env.get_template("verify_email.html")
-    verify_link = f"http://127.0.0.1:8000/auth/email-verify?token={token}"
-    
-    return template.render(verify_link=verify_link)
\ No newline at end of file
+    if revoked_tokens_cache.get(digest):
+        blacklist_cache_hits_total.inc()
+        return False
+
+    blacklist_cache_misses_total.inc()
+
+    expire_token = payload.get('exp')
+    datetime_now = int(datetime.now(timezone.utc).timestamp())
+    ttl = max(expire_token - datetime_now, 1)
+    keys = [f'blacklist:{digest}']
+
+    if settings.BLACKLIST_CHECK_LEGACY_KEYS:
+        keys.append(f'blacklist:{token}')
+
+    revoke_token = redis.register_script(REVOKE_TOKEN_SCRIPT)
+    is_revoked = await revoke_token(keys=keys, args=[ttl, BLACKLIST_CHANNEL, f'{digest}:{expire_token}'])
+
+    mark_token_revoked(digest, expire_token)
+
+    return bool(is_revoked)
+
+async def listen_blacklist_revocations(redis: Redis) -> None:
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(BLACKLIST_CHANNEL)
+
+                async for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        digest, expire_token = message['data'].decode().split(':')
+                        mark_token_revoked(digest, float(expire_token))
+        except RedisError:
+            await asyncio.sleep(1)
+
+def create_verify_email_link(user_id: int) -> str:
+    verify_token = create_jwt_token(payload={'sub': str(user_id)}, expire_delta=timedelta(minutes=settings.EMAIL_VERIFY_EXPIRE_MINUTES))
+
+    return f"http://127.0.0.1:8000/auth/email-verify?token={verify_token}"
\ No newline at end of file
@@ -0,0 +1,71 @@
+''' Redis memory and lookup latency of the raw-token vs digest-keyed refresh blacklist.
+
+Run from backend/: python -m benchmarks.blacklist_keyspace [tokens] [redis_db]
+The given Redis database (15 by default) is flushed before and after each scheme.
+'''
+import asyncio
+import sys
+
+from datetime import timedelta
+from time import perf_counter
+
+from redis.asyncio import Redis
+
+from src.config import settings
+from auth.utils import create_jwt_token, get_token_digest
+
+from .common import summarize, report
+
+
+BATCH_SIZE = 10000
+LOOKUPS = 10000
+
+async def fill(redis: Redis, keys: list[str], ttl: int) -> None:
+    for offset in range(0, len(keys), BATCH_SIZE):
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys[offset:offset + BATCH_SIZE]:
+                pipe.set(key, 1, ex=ttl)
+
+            await pipe.execute()
+
+async def run(redis: Redis, keys: list[str], ttl: int) -> dict:
+    await redis.flushdb()
+    baseline = (await redis.info('memory'))['used_memory']
+
+    await fill(redis, keys, ttl)
+    used = (await redis.info('memory'))['used_memory'] - baseline
+
+    latencies = []
+    start = perf_counter()
+
+    for key in keys[:LOOKUPS]:
+        lookup_start = perf_counter()
+        await redis.exists(key)
+        latencies.append(perf_counter() - lookup_start)
+
+    elapsed = perf_counter() - start
+    await redis.flushdb()
+
+    return {'used_memory_mb': round(used / 1024 / 1024, 2), 'bytes_per_entry': round(used / len(keys), 1), 'exists': summarize(latencies, elapsed)}
+
+async def main(tokens: int, redis_db: int) -> None:
+    redis = Redis.from_url(f'{settings.REDIS_URL}/{redis_db}')
+    token = create_jwt_token({'sub': '1'}, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+    ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+    raw_keys = [f'blacklist:{token}{i}' for i in range(tokens)]
+    digest_keys = [f'blacklist:{get_token_digest(key)}' for key in raw_keys]
+
+    report('blacklist_keyspace', {
+        'tokens': tokens,
+        'raw_token_keys': await run(redis, raw_keys, ttl),
+        'digest_keys': await run(redis, digest_keys, ttl),
+    })
+
+    await redis.aclose()
+
+if __name__ == '__main__':
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    redis_db = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    asyncio.run(main(tokens, redis_db))
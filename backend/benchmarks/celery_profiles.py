@@ -0,0 +1,75 @@
+''' Task throughput per Celery profile over the in-memory transport.
+
+Run from backend/: python -m benchmarks.celery_profiles [tasks]
+Publishes a payload the size of a verification email to the emails queue and
+consumes it with an embedded solo worker, once per profile, with and without
+task compression.
+'''
+import sys
+import threading
+
+from time import perf_counter
+
+from celery.contrib.testing.worker import start_worker
+
+from src.config import CELERY_PROFILES
+from src.celery import celery_app
+
+from .common import report
+
+
+PAYLOAD = {'to_email': 'user@bench.local', 'subject': 'benchmark', 'context': {'verify_link': 'x' * 300}}
+
+consumed = 0
+done = threading.Event()
+
+@celery_app.task(name='auth.tasks.benchmark_noop_task')
+def benchmark_noop_task(**kwargs) -> None:
+    global consumed
+    consumed += 1
+
+    if consumed >= benchmark_noop_task.expected:
+        done.set()
+
+def run(profile: str, compression: str | None, tasks: int) -> dict:
+    global consumed
+    consumed = 0
+    done.clear()
+    benchmark_noop_task.expected = tasks
+
+    celery_app.conf.update(task_compression=compression, **CELERY_PROFILES[profile])
+
+    start = perf_counter()
+
+    for _ in range(tasks):
+        benchmark_noop_task.apply_async(kwargs=PAYLOAD)
+
+    published = perf_counter() - start
+
+    with start_worker(celery_app, pool='solo', perform_ping_check=False, shutdown_timeout=10):
+        done.wait(timeout=300)
+
+    total = perf_counter() - start
+
+    return {
+        'publish_per_sec': round(tasks / published, 2),
+        'end_to_end_per_sec': round(consumed / total, 2),
+        'consumed': consumed,
+    }
+
+def main(tasks: int) -> None:
+    celery_app.conf.update(broker_url='memory://', broker_transport_options={}, task_annotations={})
+
+    report('celery_profiles', {
+        'tasks': tasks,
+        **{
+            f'{profile}_{compression or "uncompressed"}': run(profile, compression, tasks)
+            for profile in CELERY_PROFILES
+            for compression in ('gzip', None)
+        },
+    })
+
+if __name__ == '__main__':
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    main(tasks)
@@ -0,0 +1,31 @@
+import json
+import sys
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+
+    return ordered[index]
+
+def summarize(samples: list[float], elapsed: float, cpu: float | None = None) -> dict:
+    ''' Latency samples in seconds -> throughput and percentiles in milliseconds, plus process CPU per sample if given '''
+    summary = {
+        'count': len(samples),
+        'throughput_per_sec': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+    if cpu is not None:
+        summary['cpu_us_per_op'] = round(cpu / len(samples) * 1_000_000, 2) if samples else 0.0
+
+    return summary
+
+def report(name: str, results: dict) -> None:
+    json.dump({'benchmark': name, 'results': results}, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write('\n')
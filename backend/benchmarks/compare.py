@@ -0,0 +1,84 @@
+''' Compares two benchmark JSON reports and fails on regressions past a threshold.
+
+Run from backend/: python -m benchmarks.compare baseline.json current.json [--threshold 0.1]
+Metrics ending in _per_sec are better when higher, metrics ending in _ms or _us_per_op
+(and cpu_us_per_request) are better when lower. Other values are ignored. Exits 1 if
+any metric got worse by more than the threshold, as a fraction of the baseline.
+'''
+import argparse
+import json
+import sys
+
+from typing import Iterator
+
+from .common import report
+
+
+def is_higher_better(name: str) -> bool | None:
+    if name.endswith('_per_sec'):
+        return True
+
+    if name.endswith(('_ms', '_us_per_op', '_us_per_request')):
+        return False
+
+    return None
+
+def iter_metrics(results: dict, prefix: str = '') -> Iterator[tuple[str, float]]:
+    for key, value in results.items():
+        path = f'{prefix}.{key}' if prefix else key
+
+        if isinstance(value, dict):
+            yield from iter_metrics(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and is_higher_better(key) is not None:
+            yield path, float(value)
+
+def compare(baseline: dict, current: dict, threshold: float) -> dict:
+    current_metrics = dict(iter_metrics(current['results']))
+    regressions = {}
+    improvements = {}
+
+    for path, before in iter_metrics(baseline['results']):
+        after = current_metrics.get(path)
+
+        if after is None or before == 0:
+            continue
+
+        change = (after - before) / before
+
+        if not is_higher_better(path.rsplit('.', 1)[-1]):
+            change = -change
+
+        entry = {'baseline': before, 'current': after, 'change': round(change, 4)}
+
+        if change < -threshold:
+            regressions[path] = entry
+        elif change > threshold:
+            improvements[path] = entry
+
+    return {'threshold': threshold, 'regressions': regressions, 'improvements': improvements}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    with open(args.current, encoding='utf-8') as file:
+        current = json.load(file)
+
+    if baseline['benchmark'] != current['benchmark']:
+        parser.error(f'Reports are from different benchmarks: {baseline["benchmark"]} and {current["benchmark"]}')
+
+    result = compare(baseline, current, args.threshold)
+
+    report(f'compare:{current["benchmark"]}', result)
+
+    if result['regressions']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
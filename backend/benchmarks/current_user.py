@@ -0,0 +1,80 @@
+''' Authenticated-request throughput of the current user dependencies, without database or Redis.
+
+Run from backend/: python -m benchmarks.current_user [requests]
+Requests go through an in-process ASGI app. The baseline decodes the token in each of
+three dependencies, like routes that re-read the cookie themselves.
+'''
+import asyncio
+import sys
+
+from time import perf_counter
+
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from auth.keys import decode_jwt
+from auth.utils import create_access_token
+from users.models import UserRoleEnum
+from src.dependencies import CurrentUser, get_current_user, get_token_payload, require_roles
+
+from .common import summarize, report
+
+
+async def decode_cookie(request: Request) -> dict:
+    return decode_jwt(request.cookies['access_token'])
+
+async def decode_cookie_again(request: Request) -> dict:
+    return decode_jwt(request.cookies['access_token'])
+
+async def decode_cookie_once_more(request: Request) -> dict:
+    return decode_jwt(request.cookies['access_token'])
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/baseline')
+    async def baseline(first: dict = Depends(decode_cookie), second: dict = Depends(decode_cookie_again), third: dict = Depends(decode_cookie_once_more)):
+        return {'id': first['sub']}
+
+    @app.get('/claims')
+    async def claims(user: CurrentUser = Depends(get_current_user)):
+        return {'id': user.id}
+
+    @app.get('/roles')
+    async def roles(
+        user: CurrentUser = Depends(get_current_user),
+        moderator: CurrentUser = Depends(require_roles(UserRoleEnum.MODERATOR, UserRoleEnum.ADMIN)),
+        payload: dict = Depends(get_token_payload),
+    ):
+        return {'id': user.id}
+
+    return app
+
+async def measure(client: AsyncClient, path: str, requests: int) -> dict:
+    latencies = []
+    start = perf_counter()
+
+    for _ in range(requests):
+        request_start = perf_counter()
+        response = await client.get(path)
+        latencies.append(perf_counter() - request_start)
+
+        response.raise_for_status()
+
+    return summarize(latencies, perf_counter() - start)
+
+async def main(requests: int) -> None:
+    token = create_access_token({'sub': '1', 'role': UserRoleEnum.ADMIN.value})
+
+    async with AsyncClient(transport=ASGITransport(app=build_app()), base_url='http://bench', cookies={'access_token': token}) as client:
+        report('current_user', {
+            'requests': requests,
+            'decode_per_dependency': await measure(client, '/baseline', requests),
+            'claims_only': await measure(client, '/claims', requests),
+            'claims_with_role_check': await measure(client, '/roles', requests),
+        })
+
+if __name__ == '__main__':
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    asyncio.run(main(requests))
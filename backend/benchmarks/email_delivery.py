@@ -0,0 +1,81 @@
+''' Mail throughput: asyncio.run + fresh SMTP session per message vs pooled session and batching.
+
+Run from backend/: python -m benchmarks.email_delivery [messages] [batch_size]
+Needs aiosmtpd; a local sink server replaces the real SMTP provider. Exits non-zero
+unless the sink received every message on all three paths.
+'''
+import asyncio
+import sys
+import aiosmtplib
+
+from time import perf_counter
+
+from aiosmtpd.controller import Controller
+
+from src.config import settings
+from src.celery import run_async
+from src.smtp import smtp_pool
+from src.templates import render_template
+from auth.tasks import build_email_message, send_template_email_task, send_template_email_batch_task
+
+from .common import report
+
+
+class CountingHandler:
+    def __init__(self) -> None:
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        self.received += 1
+        return '250 OK'
+
+def send_with_fresh_connection(to_email: str, subject: str, template_name: str, context: dict) -> None:
+    message = build_email_message(to_email, subject, render_template(template_name, context))
+    asyncio.run(aiosmtplib.send(message, hostname=settings.SMTP_HOST, port=settings.SMTP_PORT))
+
+def measure(send, emails: list[dict]) -> float:
+    start = perf_counter()
+    send(emails)
+
+    return round(len(emails) / (perf_counter() - start), 2)
+
+def main(messages: int, batch_size: int) -> None:
+    handler = CountingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=8025)
+    controller.start()
+
+    settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_START_TLS = '127.0.0.1', 8025, False
+    # The sink takes mail without AUTH, so only the sender address is set
+    settings.SMTP_USER, settings.SMTP_PASSWORD, settings.SMTP_FROM = '', '', 'bench@example.com'
+
+    emails = [
+        {
+            'to_email': f'user{i}@example.com',
+            'subject': 'Подтверждение учетной записи',
+            'template_name': 'verify_email.html',
+            'context': {'verify_link': f'http://127.0.0.1:8000/auth/email-verify?token={i}'},
+        }
+        for i in range(messages)
+    ]
+
+    results = {
+        'messages': messages,
+        'asyncio_run_per_message_per_sec': measure(lambda emails: [send_with_fresh_connection(**email) for email in emails], emails),
+        'pooled_per_message_per_sec': measure(lambda emails: [send_template_email_task(**email) for email in emails], emails),
+        'pooled_batch_per_sec': measure(lambda emails: [send_template_email_batch_task(emails[i:i + batch_size]) for i in range(0, len(emails), batch_size)], emails),
+    }
+
+    run_async(smtp_pool.close())
+    controller.stop()
+
+    results['received'] = handler.received
+    report('email_delivery', results)
+
+    if handler.received != 3 * messages:
+        sys.exit('some messages were not delivered')
+
+if __name__ == '__main__':
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    main(messages, batch_size)
@@ -0,0 +1,68 @@
+''' Login DB path throughput under each engine profile (dev/prod).
+
+Run from backend/: python -m benchmarks.engine_profiles [concurrency] [logins]
+Each profile gets its own engine; concurrency above pool_size + max_overflow
+shows up as pool wait time.
+'''
+import asyncio
+import logging
+import sys
+
+from time import perf_counter
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings, DB_PROFILES
+from src.database import create_database_engine, db_pool_wait_seconds
+from users.models import UserModel
+from users.queries import get_user_credentials_by_email
+
+from .common import summarize, report
+
+
+async def run_profile(profile: str, concurrency: int, logins: int) -> dict:
+    engine = create_database_engine(settings.model_copy(update={'DB_PROFILE': profile}).DATABASE_ENGINE_OPTIONS)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+
+    async with session_factory() as db:
+        emails = list((await db.scalars(select(UserModel.email).limit(500))).all())
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    wait_count, wait_sum = db_pool_wait_seconds.count, db_pool_wait_seconds.sum
+
+    async def login(i: int) -> None:
+        async with semaphore:
+            start = perf_counter()
+
+            async with session_factory() as db:
+                await get_user_credentials_by_email(emails[i % len(emails)], db)
+
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    elapsed = perf_counter() - start
+
+    checkouts = db_pool_wait_seconds.count - wait_count
+    await engine.dispose()
+
+    return {
+        **summarize(latencies, elapsed),
+        'pool_wait_avg_ms': round((db_pool_wait_seconds.sum - wait_sum) / checkouts * 1000, 3) if checkouts else 0.0,
+    }
+
+async def main(concurrency: int, logins: int) -> None:
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+
+    report('engine_profiles', {
+        'concurrency': concurrency,
+        **{profile: await run_profile(profile, concurrency, logins) for profile in DB_PROFILES},
+    })
+
+if __name__ == '__main__':
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    asyncio.run(main(concurrency, logins))
@@ -0,0 +1,80 @@
+''' Overhead of the always-on instrumentation: timed() stage hooks and the timing middleware.
+
+Run from backend/: python -m benchmarks.instrumentation [iterations]
+'''
+import asyncio
+import sys
+
+from time import perf_counter
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.instrumentation import TimingMiddleware, timed
+
+from .common import report
+
+
+def plain() -> int:
+    return 1
+
+async def plain_async() -> int:
+    return 1
+
+timed_sync = timed('benchmark_sync')(plain)
+timed_async = timed('benchmark_async')(plain_async)
+
+def measure_sync(func, iterations: int) -> float:
+    start = perf_counter()
+
+    for _ in range(iterations):
+        func()
+
+    return (perf_counter() - start) / iterations * 1_000_000
+
+async def measure_async(func, iterations: int) -> float:
+    start = perf_counter()
+
+    for _ in range(iterations):
+        await func()
+
+    return (perf_counter() - start) / iterations * 1_000_000
+
+async def measure_requests(app: FastAPI, requests: int) -> float:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://bench') as client:
+        start = perf_counter()
+
+        for _ in range(requests):
+            await client.get('/ping')
+
+        return (perf_counter() - start) / requests * 1_000_000
+
+def build_app(middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    if middleware:
+        app.add_middleware(TimingMiddleware)
+
+    @app.get('/ping')
+    async def ping():
+        return {'ok': True}
+
+    return app
+
+async def main(iterations: int) -> None:
+    requests = max(1, iterations // 100)
+
+    report('instrumentation', {
+        'iterations': iterations,
+        'sync_call_us': round(measure_sync(plain, iterations), 3),
+        'sync_timed_call_us': round(measure_sync(timed_sync, iterations), 3),
+        'async_call_us': round(await measure_async(plain_async, iterations), 3),
+        'async_timed_call_us': round(await measure_async(timed_async, iterations), 3),
+        'request_us': round(await measure_requests(build_app(False), requests), 2),
+        'request_with_middleware_us': round(await measure_requests(build_app(True), requests), 2),
+    })
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    asyncio.run(main(iterations))
@@ -0,0 +1,59 @@
+''' JWT sign and verify throughput per algorithm, to choose the signing key type with data.
+
+Run from backend/: python -m benchmarks.jwt_algorithms [iterations]
+Keys are generated in memory and passed as parsed key objects, as the key ring does.
+'''
+import secrets
+import sys
+import jwt
+
+from datetime import datetime, timezone, timedelta
+from time import perf_counter
+
+from auth.keys import generate_private_key
+
+from .common import report
+
+
+def build_payload() -> dict:
+    now = datetime.now(timezone.utc)
+
+    return {'sub': '1', 'role': 'user', 'iat': now, 'exp': now + timedelta(minutes=15)}
+
+def measure(func, iterations: int) -> float:
+    start = perf_counter()
+
+    for _ in range(iterations):
+        func()
+
+    return round(iterations / (perf_counter() - start), 2)
+
+def main(iterations: int) -> None:
+    secret = secrets.token_hex(32)
+    ed25519_key = generate_private_key('EdDSA')
+    es256_key = generate_private_key('ES256')
+
+    algorithms = {
+        'HS256': (secret, secret),
+        'EdDSA': (ed25519_key, ed25519_key.public_key()),
+        'ES256': (es256_key, es256_key.public_key()),
+    }
+
+    payload = build_payload()
+    results = {'iterations': iterations}
+
+    for algorithm, (signing_key, verifying_key) in algorithms.items():
+        token = jwt.encode(payload, signing_key, algorithm=algorithm, headers={'kid': 'benchmark'})
+
+        results[algorithm] = {
+            'token_bytes': len(token),
+            'sign_per_sec': measure(lambda: jwt.encode(payload, signing_key, algorithm=algorithm, headers={'kid': 'benchmark'}), iterations),
+            'verify_per_sec': measure(lambda: jwt.decode(token, verifying_key, algorithms=[algorithm]), iterations),
+        }
+
+    report('jwt_algorithms', results)
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    main(iterations)
@@ -0,0 +1,41 @@
+''' Access-token verification throughput with and without the verified-JWT cache.
+
+Run from backend/: python -m benchmarks.jwt_cache [iterations] [distinct_tokens]
+'''
+import sys
+
+from datetime import timedelta
+from time import perf_counter
+
+from auth.keys import decode_jwt
+from auth.utils import create_jwt_token, verify_jwt_token, jwt_cache, jwt_cache_hits_total, jwt_cache_misses_total
+
+from .common import report
+
+
+def measure(verify, tokens: list[str], iterations: int) -> float:
+    start = perf_counter()
+
+    for i in range(iterations):
+        verify(tokens[i % len(tokens)])
+
+    return round(iterations / (perf_counter() - start), 2)
+
+def main(iterations: int, distinct_tokens: int) -> None:
+    tokens = [create_jwt_token({'sub': str(i), 'role': 'user'}, timedelta(minutes=15)) for i in range(distinct_tokens)]
+    jwt_cache.clear()
+
+    report('jwt_cache', {
+        'iterations': iterations,
+        'distinct_tokens': distinct_tokens,
+        'uncached_decodes_per_sec': measure(decode_jwt, tokens, iterations),
+        'cached_decodes_per_sec': measure(verify_jwt_token, tokens, iterations),
+        'cache_hits': jwt_cache_hits_total.value,
+        'cache_misses': jwt_cache_misses_total.value,
+    })
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    distinct_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    main(iterations, distinct_tokens)
@@ -0,0 +1,213 @@
+''' End-to-end load test of the auth API against the real main.app, in one process.
+
+Run from backend/: python -m benchmarks.load [--users 200] [--concurrency 20] [--refreshes 5] [--fakeredis] > load.json
+Needs a local Postgres from the DB_* settings. Redis comes from the REDIS_* settings,
+or from an in-process fakeredis server with --fakeredis (install fakeredis[lua], the
+API runs Lua scripts). Celery uses the in-memory broker with an in-process worker,
+and mail goes to an aiosmtpd sink, so no RabbitMQ or SMTP server is needed.
+
+Each virtual user registers, gets the verification email delivered through the
+outbox, verifies, logs in, refreshes --refreshes times and logs out. Every user has
+its own client address, so the per-IP rate limits apply as in production. Users are
+created with a per-run email prefix, and only outbox rows with that prefix are drained.
+The users and any leftover rows are deleted afterwards.
+'''
+import argparse
+import asyncio
+import re
+import socket
+import threading
+import uuid
+
+from contextlib import suppress
+from email import message_from_bytes, policy
+from time import perf_counter, process_time
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from celery.contrib.testing.worker import start_worker
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from src.config import settings
+from src.celery import celery_app
+from src.database import async_session
+from users.models import UserModel
+from outbox.models import OutboxMessageModel
+from outbox.tasks import drain_outbox
+from main import app
+
+from .common import summarize, report
+
+
+PASSWORD = 'benchmark_password_1!'
+VERIFY_TOKEN_PATTERN = re.compile(r'email-verify\?token=([\w.\-]+)')
+
+class MailSink:
+    ''' aiosmtpd handler that keeps the verification token of each recipient '''
+    def __init__(self) -> None:
+        self.tokens: dict[str, str] = {}
+        self.received = asyncio.Event()
+        self.expected = 0
+        self._loop = asyncio.get_running_loop()
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        message = message_from_bytes(envelope.content, policy=policy.default)
+        match = VERIFY_TOKEN_PATTERN.search(message.get_body(preferencelist=('html',)).get_content())
+
+        if match:
+            self.tokens[message['To']] = match.group(1)
+
+        if len(self.tokens) >= self.expected:
+            self._loop.call_soon_threadsafe(self.received.set)
+
+        return '250 OK'
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_fakeredis() -> None:
+    from fakeredis import TcpFakeServer
+
+    port = get_free_port()
+    server = TcpFakeServer(('127.0.0.1', port), server_type='redis')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.REDIS_HOST = '127.0.0.1'
+    settings.REDIS_PORT = str(port)
+    settings.REDIS_SOCKET_PATH = None
+    settings.REDIS_SENTINELS = []
+    settings.REDIS_PROTOCOL = '2'
+
+class Phase:
+    ''' Latencies and status codes of one endpoint across all virtual users '''
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors: dict[int, int] = {}
+        self.elapsed = 0.0
+        self.cpu = 0.0
+
+    async def request(self, client: AsyncClient, method: str, url: str, expected: int, **kwargs):
+        start = perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies.append(perf_counter() - start)
+
+        if response.status_code != expected:
+            self.errors[response.status_code] = self.errors.get(response.status_code, 0) + 1
+
+        return response
+
+    def summary(self) -> dict:
+        summary = summarize(self.latencies, self.elapsed)
+        summary['cpu_us_per_request'] = round(self.cpu / len(self.latencies) * 1_000_000, 2) if self.latencies else 0.0
+        summary['errors'] = {str(status): count for status, count in self.errors.items()}
+
+        return summary
+
+async def run_phase(phase: Phase, clients: list[AsyncClient], concurrency: int, func) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int, client: AsyncClient) -> None:
+        async with semaphore:
+            await func(phase, index, client)
+
+    cpu_start = process_time()
+    start = perf_counter()
+    await asyncio.gather(*(run(index, client) for index, client in enumerate(clients)))
+    phase.elapsed = perf_counter() - start
+    phase.cpu = process_time() - cpu_start
+
+async def main(args: argparse.Namespace) -> None:
+    if args.fakeredis:
+        start_fakeredis()
+
+    run_prefix = f'bench-{uuid.uuid4().hex[:8]}'
+    emails = [f'{run_prefix}-{index}@example.com' for index in range(args.users)]
+
+    sink = MailSink()
+    smtp_port = get_free_port()
+    controller = Controller(sink, hostname='127.0.0.1', port=smtp_port, authenticator=lambda *args: AuthResult(success=True), auth_require_tls=False)
+    controller.start()
+
+    settings.SMTP_HOST = '127.0.0.1'
+    settings.SMTP_PORT = smtp_port
+    settings.SMTP_START_TLS = False
+    settings.SMTP_USER = 'bench'
+    settings.SMTP_PASSWORD = 'bench'
+    settings.SMTP_FROM = 'bench@example.com'
+    celery_app.conf.update(broker_url='memory://', broker_transport_options={})
+
+    clients = [
+        AsyncClient(transport=ASGITransport(app=app, client=(f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}', 50000)), base_url='https://bench')
+        for index in range(args.users)
+    ]
+    # Only this run's rows are drained, so real queued emails on a shared database are left alone
+    is_run_email = OutboxMessageModel.payload['to_email'].astext.like(f'{run_prefix}-%')
+    phases = {name: Phase() for name in ('registration', 'email_verify', 'login', 'refresh', 'logout')}
+
+    async def register(phase: Phase, index: int, client: AsyncClient) -> None:
+        await phase.request(client, 'POST', '/auth/registration', 201, json={'email': emails[index], 'password': PASSWORD})
+
+    async def verify(phase: Phase, index: int, client: AsyncClient) -> None:
+        await phase.request(client, 'GET', '/auth/email-verify', 200, params={'token': sink.tokens.get(emails[index], '')})
+
+    async def login(phase: Phase, index: int, client: AsyncClient) -> None:
+        await phase.request(client, 'POST', '/auth/login', 200, json={'email': emails[index], 'password': PASSWORD})
+
+    async def refresh(phase: Phase, index: int, client: AsyncClient) -> None:
+        for _ in range(args.refreshes):
+            await phase.request(client, 'POST', '/auth/refresh', 200)
+
+    async def logout(phase: Phase, index: int, client: AsyncClient) -> None:
+        await phase.request(client, 'POST', '/auth/logout', 200)
+
+    try:
+        async with app.router.lifespan_context(app):
+            with start_worker(celery_app, pool='solo', perform_ping_check=False, queues=['default', 'emails', 'outbox']):
+                await run_phase(phases['registration'], clients, args.concurrency, register)
+
+                # Only registrations that succeeded leave an email in the outbox
+                sink.expected = len(phases['registration'].latencies) - sum(phases['registration'].errors.values())
+                delivery_start = perf_counter()
+                await drain_outbox(is_run_email)
+
+                # A timeout still gets a report, the emails count shows what was delivered
+                if sink.expected:
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(sink.received.wait(), args.delivery_timeout)
+
+                delivery_elapsed = perf_counter() - delivery_start
+
+            for name, func in (('email_verify', verify), ('login', login), ('refresh', refresh), ('logout', logout)):
+                await run_phase(phases[name], clients, args.concurrency, func)
+    finally:
+        for client in clients:
+            await client.aclose()
+
+        controller.stop()
+
+        async with async_session() as db:
+            await db.execute(delete(UserModel).where(UserModel.email.like(f'{run_prefix}-%')))
+            await db.execute(delete(OutboxMessageModel).where(is_run_email))
+            await db.commit()
+
+    report('load', {
+        'users': args.users,
+        'concurrency': args.concurrency,
+        'refreshes_per_user': args.refreshes,
+        'redis': 'fakeredis' if args.fakeredis else settings.REDIS_URL,
+        'email_delivery': {'expected': sink.expected, 'emails': len(sink.tokens), 'elapsed_sec': round(delivery_elapsed, 3)},
+        **{name: phase.summary() for name, phase in phases.items()},
+    })
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--refreshes', type=int, default=5)
+    parser.add_argument('--delivery-timeout', type=float, default=60.0)
+    parser.add_argument('--fakeredis', action='store_true')
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,66 @@
+''' Login latency under concurrency with bcrypt inline vs offloaded to the hashing pool.
+
+Run from backend/: python -m benchmarks.login_latency [concurrency] [requests]
+Besides login latency, a ticker coroutine measures how long the event loop stalls,
+which is what every other request on the worker (e.g. /auth/refresh) experiences.
+'''
+import asyncio
+import sys
+import bcrypt
+
+from time import perf_counter
+
+from auth.utils import verify_password
+from auth.hashing import shutdown_hashing_executor
+
+from .common import summarize, report
+
+
+PASSWORD = 'benchmark_password_1!'
+
+async def inline_verify(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
+async def ticker(stop: asyncio.Event, stalls: list[float], interval: float = 0.005) -> None:
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(perf_counter() - start - interval)
+
+async def run(verify, concurrency: int, requests: int, hashed_password: str) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    stalls: list[float] = []
+    stop = asyncio.Event()
+
+    async def login() -> None:
+        async with semaphore:
+            start = perf_counter()
+            await verify(PASSWORD, hashed_password)
+            latencies.append(perf_counter() - start)
+
+    ticker_task = asyncio.create_task(ticker(stop, stalls))
+    start = perf_counter()
+    await asyncio.gather(*(login() for _ in range(requests)))
+    elapsed = perf_counter() - start
+    stop.set()
+    await ticker_task
+
+    return {'login': summarize(latencies, elapsed), 'event_loop_stall': summarize(stalls, elapsed)}
+
+async def main(concurrency: int, requests: int) -> None:
+    hashed_password = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt()).decode()
+
+    report('login_latency', {
+        'concurrency': concurrency,
+        'inline': await run(inline_verify, concurrency, requests, hashed_password),
+        'pool': await run(verify_password, concurrency, requests, hashed_password),
+    })
+
+    shutdown_hashing_executor()
+
+if __name__ == '__main__':
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    asyncio.run(main(concurrency, requests))
@@ -0,0 +1,62 @@
+''' Microbenchmarks of the CPU-bound pieces of the auth flow.
+
+Run from backend/: python -m benchmarks.micro [iterations] > micro.json
+Covers JWT encode/decode, password hashing and verification with the configured
+PASSWORD_HASHER cost, registration schema validation and template rendering. Every
+case runs a fixed warm-up first and uses fixed inputs, so runs are comparable with
+python -m benchmarks.compare.
+'''
+import sys
+
+from datetime import timedelta
+from time import perf_counter, process_time
+from typing import Callable
+
+from auth.keys import decode_jwt
+from auth.utils import create_jwt_token
+from auth.hashing import get_password_hasher
+from auth.schemas import UserRegistrationSchema
+from src.templates import render_template
+
+from .common import summarize, report
+
+
+PASSWORD = 'benchmark_password_1!'
+
+def measure(func: Callable[[], object], iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        func()
+
+    latencies = []
+    cpu_start = process_time()
+    start = perf_counter()
+
+    for _ in range(iterations):
+        call_start = perf_counter()
+        func()
+        latencies.append(perf_counter() - call_start)
+
+    return summarize(latencies, perf_counter() - start, process_time() - cpu_start)
+
+def main(iterations: int) -> None:
+    hasher = get_password_hasher()
+    hashed_password = hasher.hash(PASSWORD)
+    token = create_jwt_token({'sub': '1', 'role': 'user'}, timedelta(minutes=15))
+    registration_data = {'email': 'user@example.com', 'password': PASSWORD}
+    template_context = {'verify_link': f'http://127.0.0.1:8000/auth/email-verify?token={token}'}
+    hashing_iterations = max(1, iterations // 1000)
+
+    report('micro', {
+        'iterations': iterations,
+        'jwt_encode': measure(lambda: create_jwt_token({'sub': '1', 'role': 'user'}, timedelta(minutes=15)), iterations, 100),
+        'jwt_decode': measure(lambda: decode_jwt(token), iterations, 100),
+        'password_hash': measure(lambda: hasher.hash(PASSWORD), hashing_iterations, 1),
+        'password_verify': measure(lambda: hasher.verify(PASSWORD, hashed_password), hashing_iterations, 1),
+        'registration_schema': measure(lambda: UserRegistrationSchema.model_validate(registration_data), iterations, 100),
+        'template_render': measure(lambda: render_template('verify_email.html', template_context), iterations, 100),
+    })
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    main(iterations)
@@ -0,0 +1,79 @@
+''' Outbox drain throughput into an in-memory Celery broker.
+
+Run from backend/: python -m benchmarks.outbox_dispatch [messages]
+Needs Postgres with migrations applied. Only rows tagged with this run's marker
+are drained, so real queued messages are left alone. Checks that every row is
+published exactly once, batched into send_template_email_batch_task, and
+removed from outbox_messages.
+'''
+import asyncio
+import sys
+import uuid
+
+from time import perf_counter
+
+from sqlalchemy import delete, func, select
+
+from src.celery import celery_app
+from src.database import async_engine, async_session
+from outbox.models import OutboxMessageModel
+from outbox.services import add_outbox_message
+from outbox.tasks import drain_outbox
+
+from .common import report
+
+
+async def main(messages: int) -> None:
+    celery_app.conf.broker_url = 'memory://'
+    celery_app.conf.broker_transport_options = {}
+
+    # The template ignores unknown context keys, so the marker rides along in the payload harmlessly
+    marker = uuid.uuid4().hex
+    is_benchmark_row = OutboxMessageModel.payload.contains({'context': {'benchmark_run': marker}})
+
+    async with async_session() as db:
+        for i in range(messages):
+            await add_outbox_message('auth.tasks.send_template_email_task', {
+                'to_email': f'user{i}@example.com',
+                'subject': 'benchmark',
+                'template_name': 'verify_email.html',
+                'context': {'verify_link': f'http://127.0.0.1:8000/auth/email-verify?token={i}', 'benchmark_run': marker},
+            }, db)
+
+        await db.commit()
+
+    start = perf_counter()
+    dispatched = await drain_outbox(is_benchmark_row)
+    elapsed = perf_counter() - start
+
+    tasks, published = 0, 0
+
+    with celery_app.connection_for_write() as connection:
+        while (message := connection.default_channel.basic_get('emails', no_ack=True)) is not None:
+            args, kwargs, embed = message.decode()
+            tasks += 1
+            published += len(args[0]) if message.headers['task'] == 'auth.tasks.send_template_email_batch_task' else 1
+
+    async with async_session() as db:
+        remaining = await db.scalar(select(func.count()).select_from(OutboxMessageModel).where(is_benchmark_row))
+        await db.execute(delete(OutboxMessageModel).where(is_benchmark_row))
+        await db.commit()
+
+    await async_engine.dispose()
+
+    report('outbox_dispatch', {
+        'messages': messages,
+        'dispatched': dispatched,
+        'published': published,
+        'published_tasks': tasks,
+        'remaining_rows': remaining,
+        'messages_per_sec': round(dispatched / elapsed, 2),
+    })
+
+    if published != messages or remaining:
+        sys.exit('outbox rows were lost or left behind')
+
+if __name__ == '__main__':
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    asyncio.run(main(messages))
@@ -0,0 +1,78 @@
+''' Password policy checker versus the previous lookahead regex: throughput and a fuzz comparison.
+
+Run from backend/: python -m benchmarks.password_policy [iterations] [fuzz_cases]
+The fuzz pass uses the default policy settings and exits non-zero if the checker and
+the regex ever disagree on whether a password is accepted.
+'''
+import random
+import re
+import sys
+
+from time import perf_counter
+
+from auth.password_policy import PasswordPolicy
+
+from .common import report
+
+
+LEGACY_PASSWORD_REGEX = r"^(?=.*[A-Za-z])(?=.*\d)(?=.*[@$!%*#?&_])[A-Za-z\d@$!%*#?&_]{8,}$"
+
+DEFAULT_POLICY = PasswordPolicy(
+    min_length=8,
+    require_letter=True,
+    require_digit=True,
+    require_special=True,
+    special_characters=frozenset('@$!%*#?&_'),
+)
+
+# Allowed characters plus the edge cases of the regex: other punctuation, whitespace,
+# non-ASCII letters and non-ASCII decimal digits that \d also matches
+FUZZ_ALPHABET = 'aZqM' + '0179' + '@$!%*#?&_' + '^-+. \n\t' + 'éЖß' + '٣५０'
+
+def legacy_check(password: str) -> bool:
+    return re.fullmatch(LEGACY_PASSWORD_REGEX, password) is not None
+
+def policy_check(password: str) -> bool:
+    return DEFAULT_POLICY.check(password) is None
+
+def fuzz(cases: int, rng: random.Random) -> list[str]:
+    mismatches = []
+
+    for _ in range(cases):
+        password = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 16)))
+
+        if legacy_check(password) != policy_check(password):
+            mismatches.append(password)
+
+    return mismatches
+
+def measure(check, passwords: list[str], iterations: int) -> float:
+    start = perf_counter()
+
+    for i in range(iterations):
+        check(passwords[i % len(passwords)])
+
+    return round(iterations / (perf_counter() - start), 2)
+
+def main(iterations: int, fuzz_cases: int) -> None:
+    rng = random.Random(0)
+    passwords = ['Str0ng_password!', 'weakpassword', 'short1!', 'N0_special_but_long1', 'x' * 60 + '1!']
+
+    mismatches = fuzz(fuzz_cases, rng)
+
+    report('password_policy', {
+        'iterations': iterations,
+        'legacy_regex_checks_per_sec': measure(legacy_check, passwords, iterations),
+        'policy_checks_per_sec': measure(policy_check, passwords, iterations),
+        'fuzz_cases': fuzz_cases,
+        'fuzz_mismatches': [repr(password) for password in mismatches[:20]],
+    })
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    fuzz_cases = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+    main(iterations, fuzz_cases)
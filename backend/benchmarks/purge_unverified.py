@@ -0,0 +1,98 @@
+''' Checks the batched purge of expired unverified users against a local Postgres and measures it.
+
+Run from backend/: python -m benchmarks.purge_unverified [stale_users] [batch_size]
+Inserts marker users dated 1990 and purges with a cutoff of 2000, so only the markers
+qualify: stale unverified ones must go, stale verified and fresh unverified ones must
+stay, and a dry run must delete nothing. Exits non-zero if any check fails.
+'''
+import asyncio
+import sys
+import uuid
+
+from datetime import datetime
+from time import perf_counter
+
+from sqlalchemy import delete, func, insert, select, text
+
+from src.database import async_engine, async_session
+from users.models import UserModel
+from users.tasks import purge_unverified_users, select_expired_unverified_users
+
+from .common import report
+
+
+CUTOFF = datetime(2000, 1, 1)
+STALE_CREATED_AT = datetime(1990, 1, 1)
+
+async def insert_markers(prefix: str, count: int, created_at: datetime | None, is_verified: bool) -> None:
+    values = [
+        {'email': f'{prefix}-{index}@bench.local', 'password': 'marker', 'is_verified': is_verified}
+        | ({'created_at': created_at} if created_at else {})
+        for index in range(count)
+    ]
+
+    async with async_session() as db:
+        await db.execute(insert(UserModel), values)
+        await db.commit()
+
+async def count_markers(prefix: str) -> int:
+    async with async_session() as db:
+        return await db.scalar(select(func.count()).select_from(UserModel).where(UserModel.email.like(f'{prefix}-%')))
+
+async def explain_batch(batch_size: int) -> str:
+    stmt = select_expired_unverified_users(CUTOFF, (STALE_CREATED_AT, 0), batch_size)
+    compiled = stmt.compile(async_engine.sync_engine, compile_kwargs={'literal_binds': True})
+
+    async with async_session() as db:
+        return '\n'.join((await db.execute(text(f'EXPLAIN {compiled}'))).scalars().all())
+
+async def main(stale_users: int, batch_size: int) -> None:
+    run = uuid.uuid4().hex[:8]
+    stale, verified, fresh = f'purge-stale-{run}', f'purge-verified-{run}', f'purge-fresh-{run}'
+
+    await insert_markers(stale, stale_users, STALE_CREATED_AT, False)
+    await insert_markers(verified, 10, STALE_CREATED_AT, True)
+    await insert_markers(fresh, 10, None, False)
+
+    try:
+        plan = await explain_batch(batch_size)
+        dry_run = await purge_unverified_users(CUTOFF, batch_size, stale_users, dry_run=True)
+        stale_after_dry_run = await count_markers(stale)
+
+        start = perf_counter()
+        purge = await purge_unverified_users(CUTOFF, batch_size, stale_users, dry_run=False)
+        elapsed = perf_counter() - start
+
+        checks = {
+            'dry_run_found_all': dry_run['users'] == stale_users,
+            'dry_run_deleted_nothing': stale_after_dry_run == stale_users,
+            'purged_all_stale': purge['users'] == stale_users and await count_markers(stale) == 0,
+            'kept_verified': await count_markers(verified) == 10,
+            'kept_fresh': await count_markers(fresh) == 10,
+            'batches_bounded': purge['batches'] <= stale_users // batch_size + 1,
+        }
+
+        report('purge_unverified', {
+            'stale_users': stale_users,
+            'batch_size': batch_size,
+            'batches': purge['batches'],
+            'purged_per_sec': round(purge['users'] / elapsed, 2) if elapsed else 0.0,
+            'uses_partial_index': 'ix_users_unverified_created_at' in plan,
+            'plan': plan.splitlines(),
+            'checks': checks,
+        })
+    finally:
+        async with async_session() as db:
+            await db.execute(delete(UserModel).where(UserModel.email.like(f'purge-%-{run}-%')))
+            await db.commit()
+
+        await async_engine.dispose()
+
+    if not all(checks.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    stale_users = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    asyncio.run(main(stale_users, batch_size))
@@ -0,0 +1,67 @@
+''' Per-request overhead of the login rate limiters: Redis sliding window vs local fallback bucket.
+
+Run from backend/: python -m benchmarks.rate_limiter [requests]
+'''
+import asyncio
+import json
+import sys
+
+from time import perf_counter
+
+from redis.asyncio import Redis
+from starlette.requests import Request
+
+from src.config import settings
+from src.dependencies import RateLimiter, client_ip_key, email_key
+
+from .common import summarize, report
+
+
+BODY = json.dumps({'email': 'user@bench.local', 'password': 'benchmark_password_1!'}).encode()
+
+def build_request(i: int) -> Request:
+    async def receive() -> dict:
+        return {'type': 'http.request', 'body': BODY, 'more_body': False}
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/auth/login', 'headers': [], 'client': (f'10.0.{i // 256 % 256}.{i % 256}', 1234)}
+
+    return Request(scope, receive)
+
+async def measure(limiters: list[RateLimiter], redis: Redis, requests: int) -> dict:
+    latencies = []
+    start = perf_counter()
+
+    for i in range(requests):
+        request = build_request(i)
+        request_start = perf_counter()
+
+        for limiter in limiters:
+            await limiter(request, redis)
+
+        latencies.append(perf_counter() - request_start)
+
+    return summarize(latencies, perf_counter() - start)
+
+async def main(requests: int) -> None:
+    limiters = [
+        RateLimiter('bench:ip', 10 ** 9, 60, client_ip_key),
+        RateLimiter('bench:email', 10 ** 9, 60, email_key),
+    ]
+    redis = Redis.from_url(settings.REDIS_URL)
+    unavailable_redis = Redis.from_url('redis://127.0.0.1:1', socket_connect_timeout=0.01)
+
+    report('rate_limiter', {
+        'requests': requests,
+        'no_limiter': await measure([], redis, requests),
+        'redis_sliding_window': await measure(limiters, redis, requests),
+        'local_fallback': await measure(limiters, unavailable_redis, requests),
+    })
+
+    await redis.delete('ratelimit:bench:email:user@bench.local', *(f'ratelimit:bench:ip:10.0.{i // 256 % 256}.{i % 256}' for i in range(min(requests, 65536))))
+    await redis.aclose()
+    await unavailable_redis.aclose()
+
+if __name__ == '__main__':
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    asyncio.run(main(requests))
@@ -0,0 +1,66 @@
+''' Redis client behaviour with more concurrent callers than pooled connections.
+
+Run from backend/: python -m benchmarks.redis_pool [concurrency] [commands]
+With the old non-blocking pool (max_connections=10) callers beyond the limit
+fail; the blocking pool makes them wait up to REDIS_POOL_TIMEOUT instead.
+'''
+import asyncio
+import sys
+
+from time import perf_counter
+
+from redis.asyncio import Redis, ConnectionPool
+
+from src.config import settings
+from src.redis import create_redis_client, close_redis_client, redis_command_seconds
+
+from .common import summarize, report
+
+
+async def measure(redis: Redis, concurrency: int, commands: int) -> dict:
+    latencies = []
+    errors = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+
+        for _ in range(commands // concurrency):
+            start = perf_counter()
+
+            try:
+                await redis.incr(f'bench:redis_pool:{worker_id}')
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    return {'errors': errors, **summarize(latencies, perf_counter() - start)}
+
+async def main(concurrency: int, commands: int) -> None:
+    legacy_pool = ConnectionPool.from_url(settings.REDIS_URL, max_connections=10)
+    legacy_client = Redis(connection_pool=legacy_pool)
+    client = create_redis_client()
+
+    results = {
+        'concurrency': concurrency,
+        'legacy_pool_10': await measure(legacy_client, concurrency, commands),
+        'blocking_pool': await measure(client, concurrency, commands),
+    }
+    results['blocking_pool']['max_connections'] = settings.REDIS_MAX_CONNECTIONS
+    results['blocking_pool']['histogram_mean_ms'] = round(redis_command_seconds.sum / redis_command_seconds.count * 1000, 3)
+
+    await client.delete(*(f'bench:redis_pool:{i}' for i in range(concurrency)))
+    await legacy_client.aclose()
+    await legacy_pool.disconnect()
+    await close_redis_client(client)
+
+    report('redis_pool', results)
+
+if __name__ == '__main__':
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    commands = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    asyncio.run(main(concurrency, commands))
@@ -0,0 +1,73 @@
+''' Refresh-token rotation: EXISTS + SET (old flow) vs one atomic revoke script.
+
+Run from backend/: python -m benchmarks.refresh_rotation [rotations] [parallel_refreshes] [redis_db]
+Also fires N parallel rotations of the same token and checks that exactly one wins.
+'''
+import asyncio
+import sys
+
+from datetime import timedelta
+from time import perf_counter
+
+from redis.asyncio import Redis
+
+from src.config import settings
+from auth.utils import create_jwt_token, verify_jwt_token, revoke_token_once, revoked_tokens_cache, jwt_cache
+
+from .common import summarize, report
+
+
+async def old_rotation(redis: Redis, token: str, payload: dict) -> bool:
+    if await redis.exists(f'blacklist:{token}'):
+        return False
+
+    await redis.set(f'blacklist:{token}', 'true', ex=payload['exp'] - int(payload['iat']))
+
+    return True
+
+async def measure(rotate, redis: Redis, tokens: list[str]) -> dict:
+    latencies = []
+    start = perf_counter()
+
+    for token in tokens:
+        payload = verify_jwt_token(token)
+        rotation_start = perf_counter()
+        await rotate(redis, token, payload)
+        latencies.append(perf_counter() - rotation_start)
+
+    return summarize(latencies, perf_counter() - start)
+
+def issue_tokens(count: int) -> list[str]:
+    return [create_jwt_token({'sub': str(i)}, timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)) for i in range(count)]
+
+async def main(rotations: int, parallel_refreshes: int, redis_db: int) -> None:
+    redis = Redis.from_url(f'{settings.REDIS_URL}/{redis_db}')
+    await redis.flushdb()
+
+    token = create_jwt_token({'sub': '0'}, timedelta(days=1))
+    payload = verify_jwt_token(token)
+    results = await asyncio.gather(*(revoke_token_once(redis, token, payload) for _ in range(parallel_refreshes)))
+    successful_refreshes = sum(results)
+
+    revoked_tokens_cache.clear()
+    jwt_cache.clear()
+
+    report('refresh_rotation', {
+        'parallel_refreshes': parallel_refreshes,
+        'successful_refreshes': successful_refreshes,
+        'exists_then_set': await measure(old_rotation, redis, issue_tokens(rotations)),
+        'atomic_script': await measure(revoke_token_once, redis, issue_tokens(rotations)),
+    })
+
+    await redis.flushdb()
+    await redis.aclose()
+
+    if successful_refreshes != 1:
+        sys.exit(f'expected exactly one successful refresh, got {successful_refreshes}')
+
+if __name__ == '__main__':
+    rotations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    parallel_refreshes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    redis_db = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+
+    asyncio.run(main(rotations, parallel_refreshes, redis_db))
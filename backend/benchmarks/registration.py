@@ -0,0 +1,94 @@
+''' Signups/sec: SELECT + INSERT + COMMIT + refresh vs INSERT ... ON CONFLICT RETURNING.
+
+Run from backend/: python -m benchmarks.registration [signups] [concurrency]
+Password hashing is excluded (a precomputed hash is reused) so only DB work is measured.
+Every 10th signup reuses an email to exercise the duplicate path. Rows are removed afterwards.
+'''
+import asyncio
+import sys
+import bcrypt
+
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy import delete, select
+
+from src.database import async_engine, async_session
+from users.models import UserModel
+from users.queries import create_user
+
+from .common import summarize, report
+
+
+HASHED_PASSWORD = bcrypt.hashpw(b'benchmark_password_1!', bcrypt.gensalt(rounds=4)).decode()
+
+async def old_registration(email: str) -> bool:
+    async with async_session() as db:
+        user = await db.execute(select(UserModel).where(UserModel.email == email))
+
+        if user.scalar_one_or_none() is not None:
+            return False
+
+        new_user = UserModel(email=email, password=HASHED_PASSWORD)
+        db.add(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+
+        return True
+
+async def new_registration(email: str) -> bool:
+    async with async_session() as db:
+        user_id = await create_user({'email': email, 'password': HASHED_PASSWORD}, db)
+
+        if user_id is None:
+            return False
+
+        await db.commit()
+
+        return True
+
+async def measure(register, prefix: str, signups: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def signup(i: int) -> None:
+        email = f'{prefix}-{i - i % 10 if i % 10 == 9 else i}@bench.local'
+
+        async with semaphore:
+            start = perf_counter()
+
+            try:
+                await register(email)
+            except Exception:
+                pass
+
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(signup(i) for i in range(signups)))
+
+    return summarize(latencies, perf_counter() - start)
+
+async def main(signups: int, concurrency: int) -> None:
+    prefix = f'bench-{uuid4().hex[:8]}'
+
+    results = {
+        'signups': signups,
+        'concurrency': concurrency,
+        'select_insert_refresh': await measure(old_registration, f'{prefix}-old', signups, concurrency),
+        'insert_on_conflict': await measure(new_registration, f'{prefix}-new', signups, concurrency),
+    }
+
+    async with async_session() as db:
+        await db.execute(delete(UserModel).where(UserModel.email.like(f'{prefix}-%')))
+        await db.commit()
+
+    await async_engine.dispose()
+
+    report('registration', results)
+
+if __name__ == '__main__':
+    signups = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    asyncio.run(main(signups, concurrency))
@@ -0,0 +1,108 @@
+''' Checks read-replica routing of sessions and measures routed read throughput.
+
+Run from backend/: python -m benchmarks.replica_routing [lookups]
+Needs DB_REPLICA_HOSTS pointing at a second migrated database, for example
+DB_REPLICA_HOSTS='["localhost:5432/auth_replica"]'. The two databases are not
+replicated: a marker row written only to the replica, and one only to the primary,
+show where each statement went. Exits non-zero if any routing check fails.
+'''
+import asyncio
+import sys
+import uuid
+
+from time import perf_counter
+
+from sqlalchemy import delete, insert, select
+
+from src.config import settings
+from src.database import async_engine, async_session, replica_engines, healthy_replicas, check_replicas, dispose_database_engines
+from users.models import UserModel
+from users.queries import get_user_credentials_by_email, get_user_auth_by_id, update_user_password
+
+from .common import report
+
+
+async def insert_marker(engine, email: str) -> int:
+    async with engine.begin() as connection:
+        return (await connection.execute(insert(UserModel).values(email=email, password='marker').returning(UserModel.id))).scalar_one()
+
+async def delete_marker(engine, email: str) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(delete(UserModel).where(UserModel.email == email))
+
+async def run_checks(replica_email: str, primary_email: str, primary_id: int) -> dict:
+    checks = {}
+
+    await check_replicas()
+    checks['replica_healthy'] = len(healthy_replicas) == len(replica_engines)
+
+    async with async_session() as db:
+        checks['select_goes_to_replica'] = await get_user_credentials_by_email(replica_email, db) is not None
+
+        await update_user_password(primary_id, 'marker', db)
+        checks['reads_after_write_stay_on_primary'] = await get_user_credentials_by_email(primary_email, db) is not None
+        await db.rollback()
+
+    async with async_session(info={'primary': True}) as db:
+        checks['pinned_session_reads_primary'] = await get_user_credentials_by_email(primary_email, db) is not None
+
+    async with async_session() as db:
+        checks['user_auth_cache_fill_reads_primary'] = await get_user_auth_by_id(primary_id, db) is not None
+
+    async with async_session() as db:
+        row = (await db.execute(select(UserModel.id).where(UserModel.email == primary_email).with_for_update())).one_or_none()
+        checks['select_for_update_goes_to_primary'] = row is not None
+
+    max_lag = settings.DB_REPLICA_MAX_LAG_SECONDS
+    settings.DB_REPLICA_MAX_LAG_SECONDS = -1
+    await check_replicas()
+    settings.DB_REPLICA_MAX_LAG_SECONDS = max_lag
+
+    async with async_session() as db:
+        checks['lagging_replica_falls_back_to_primary'] = await get_user_credentials_by_email(primary_email, db) is not None
+
+    await check_replicas()
+
+    return checks
+
+async def measure_reads(email: str, lookups: int, info: dict) -> float:
+    start = perf_counter()
+
+    for _ in range(lookups):
+        async with async_session(info=info.copy()) as db:
+            await get_user_credentials_by_email(email, db)
+
+    return round(lookups / (perf_counter() - start), 2)
+
+async def main(lookups: int) -> None:
+    if not replica_engines:
+        sys.exit('DB_REPLICA_HOSTS is empty')
+
+    marker = uuid.uuid4().hex[:8]
+    replica_email = f'replica-{marker}@bench.local'
+    primary_email = f'primary-{marker}@bench.local'
+
+    await insert_marker(replica_engines[0], replica_email)
+    primary_id = await insert_marker(async_engine, primary_email)
+
+    try:
+        checks = await run_checks(replica_email, primary_email, primary_id)
+
+        report('replica_routing', {
+            'lookups': lookups,
+            'checks': checks,
+            'primary_reads_per_sec': await measure_reads(primary_email, lookups, {'primary': True}),
+            'routed_reads_per_sec': await measure_reads(replica_email, lookups, {}),
+        })
+    finally:
+        await delete_marker(replica_engines[0], replica_email)
+        await delete_marker(async_engine, primary_email)
+        await dispose_database_engines()
+
+    if not all(checks.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    asyncio.run(main(lookups))
@@ -0,0 +1,65 @@
+''' Per-endpoint response encoding: default FastAPI path versus orjson and precomputed bodies.
+
+Run from backend/: python -m benchmarks.serialization [iterations]
+The default path mirrors what FastAPI does for a returned dict or model without a
+response class: response_model validation, jsonable_encoder, then JSONResponse.
+'''
+import sys
+
+from time import perf_counter
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from auth.schemas import AccessTokenResponseSchema
+from auth.responses import REGISTRATION_SUCCESS, LOGOUT_SUCCESS, EMAIL_VERIFIED, message_response, access_token_response
+
+from .common import report
+
+
+ACCESS_TOKEN = 'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.' + 'x' * 120 + '.' + 'y' * 43
+
+def measure(build: Callable[[], object], iterations: int) -> float:
+    start = perf_counter()
+
+    for _ in range(iterations):
+        build()
+
+    return round(iterations / (perf_counter() - start), 2)
+
+def default_token_response() -> JSONResponse:
+    schema = AccessTokenResponseSchema(access_token=ACCESS_TOKEN)
+    validated = AccessTokenResponseSchema.model_validate(schema.model_dump())
+
+    return JSONResponse(jsonable_encoder(validated))
+
+def default_message_response(message: str) -> Callable[[], JSONResponse]:
+    return lambda: JSONResponse(jsonable_encoder({'message': message}))
+
+def main(iterations: int) -> None:
+    endpoints = {
+        'login_refresh': (default_token_response, lambda: access_token_response(ACCESS_TOKEN)),
+        'registration': (default_message_response('Пользователь успешно зарегестрирован в системе!'), lambda: message_response(REGISTRATION_SUCCESS, 201)),
+        'logout': (default_message_response('Вы успешно вышли из системы!'), lambda: message_response(LOGOUT_SUCCESS)),
+        'email_verify': (default_message_response('Учетная запись успешно активирована!'), lambda: message_response(EMAIL_VERIFIED)),
+    }
+
+    results = {'iterations': iterations}
+
+    for name, (default, optimized) in endpoints.items():
+        default_rate = measure(default, iterations)
+        optimized_rate = measure(optimized, iterations)
+
+        results[name] = {
+            'default_per_sec': default_rate,
+            'optimized_per_sec': optimized_rate,
+            'speedup': round(optimized_rate / default_rate, 2),
+        }
+
+    report('serialization', results)
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    main(iterations)
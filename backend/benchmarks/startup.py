@@ -0,0 +1,65 @@
+''' Cold start cost of the API: import time per module and lifespan warm-up time.
+
+Run from backend/: python -m benchmarks.startup [top_modules]
+Import times come from a fresh interpreter started with -X importtime.
+'''
+import asyncio
+import subprocess
+import sys
+
+from time import perf_counter
+
+from .common import report
+
+
+def profile_imports(top_modules: int) -> dict:
+    start = perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], capture_output=True, text=True, check=True)
+    wall = perf_counter() - start
+
+    modules = []
+
+    for line in result.stderr.splitlines()[1:]:
+        if not line.startswith('import time:'):
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+
+        if name.startswith('  '):
+            continue
+
+        modules.append((name.strip(), int(cumulative_us), int(self_us)))
+
+    top_level = sorted(modules, key=lambda module: module[1], reverse=True)
+
+    return {
+        'interpreter_wall_ms': round(wall * 1000, 1),
+        'top_modules': [{'module': name, 'cumulative_ms': round(cumulative / 1000, 1), 'self_ms': round(self_time / 1000, 1)} for name, cumulative, self_time in top_level[:top_modules]],
+    }
+
+async def measure_lifespan() -> dict:
+    start = perf_counter()
+    from main import app, lifespan
+    imported = perf_counter()
+
+    async with lifespan(app):
+        ready = perf_counter()
+
+    stopped = perf_counter()
+
+    return {
+        'import_ms': round((imported - start) * 1000, 1),
+        'startup_ms': round((ready - imported) * 1000, 1),
+        'shutdown_ms': round((stopped - ready) * 1000, 1),
+    }
+
+def main(top_modules: int) -> None:
+    report('startup', {
+        'imports': profile_imports(top_modules),
+        'lifespan': asyncio.run(measure_lifespan()),
+    })
+
+if __name__ == '__main__':
+    top_modules = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+
+    main(top_modules)
@@ -0,0 +1,69 @@
+''' DB queries and latency of refresh-style user lookups: ORM load vs cached auth projection.
+
+Run from backend/: python -m benchmarks.user_cache [lookups] [distinct_users]
+Needs existing rows in users; ids are taken from the table.
+'''
+import asyncio
+import sys
+
+from time import perf_counter
+
+from sqlalchemy import event, select
+
+from src.database import async_engine, async_session
+from src.redis import create_redis_client, close_redis_client
+from users.models import UserModel
+from users.cache import get_user_auth, invalidate_user_auth
+
+from .common import summarize, report
+
+
+queries = 0
+
+async def get_user_by_id(user_id: int, db) -> UserModel | None:
+    return await db.get(UserModel, user_id)
+
+def count_query(*args) -> None:
+    global queries
+    queries += 1
+
+async def measure(lookup, user_ids: list[int], lookups: int) -> dict:
+    global queries
+    queries = 0
+    latencies = []
+    start = perf_counter()
+
+    for i in range(lookups):
+        async with async_session() as db:
+            lookup_start = perf_counter()
+            await lookup(user_ids[i % len(user_ids)], db)
+            latencies.append(perf_counter() - lookup_start)
+
+    return {'db_queries': queries, **summarize(latencies, perf_counter() - start)}
+
+async def main(lookups: int, distinct_users: int) -> None:
+    redis_client = create_redis_client()
+
+    async with async_session() as db:
+        user_ids = list((await db.scalars(select(UserModel.id).limit(distinct_users))).all())
+
+    for user_id in user_ids:
+        await invalidate_user_auth(user_id, redis_client)
+
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', count_query)
+
+    report('user_cache', {
+        'lookups': lookups,
+        'distinct_users': len(user_ids),
+        'orm_get_user_by_id': await measure(get_user_by_id, user_ids, lookups),
+        'cached_get_user_auth': await measure(lambda user_id, db: get_user_auth(user_id, db, redis_client), user_ids, lookups),
+    })
+
+    await close_redis_client(redis_client)
+    await async_engine.dispose()
+
+if __name__ == '__main__':
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    distinct_users = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    asyncio.run(main(lookups, distinct_users))
@@ -0,0 +1,54 @@
+''' Rows/sec and CPU per lookup: full ORM entity load vs column-projected lambda statements.
+
+Run from backend/: python -m benchmarks.user_queries [lookups] [distinct_users]
+Needs existing rows in users.
+'''
+import asyncio
+import sys
+
+from time import perf_counter, process_time
+
+from sqlalchemy import select
+
+from src.database import async_engine, async_session
+from users.models import UserModel
+from users.queries import get_user_credentials_by_email
+
+from .common import report
+
+
+async def orm_get_user_by_email(email: str, db) -> UserModel | None:
+    result = await db.execute(select(UserModel).where(UserModel.email == email))
+
+    return result.scalar_one_or_none()
+
+async def measure(lookup, emails: list[str], lookups: int) -> dict:
+    wall_start = perf_counter()
+    cpu_start = process_time()
+
+    async with async_session() as db:
+        for i in range(lookups):
+            await lookup(emails[i % len(emails)], db)
+
+    wall = perf_counter() - wall_start
+    cpu = process_time() - cpu_start
+
+    return {'rows_per_sec': round(lookups / wall, 2), 'cpu_us_per_lookup': round(cpu / lookups * 1_000_000, 1)}
+
+async def main(lookups: int, distinct_users: int) -> None:
+    async with async_session() as db:
+        emails = list((await db.scalars(select(UserModel.email).limit(distinct_users))).all())
+
+    report('user_queries', {
+        'lookups': lookups,
+        'orm_entity': await measure(orm_get_user_by_email, emails, lookups),
+        'projected_lambda': await measure(get_user_credentials_by_email, emails, lookups),
+    })
+
+    await async_engine.dispose()
+
+if __name__ == '__main__':
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    distinct_users = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    asyncio.run(main(lookups, distinct_users))
@@ -0,0 +1,49 @@
+''' In-request cost of the verification email: render in the API vs enqueue link and render in the worker.
+
+Run from backend/: python -m benchmarks.verify_email_rendering [iterations]
+'''
+import sys
+
+from time import perf_counter
+
+from jinja2 import Environment, FileSystemLoader
+
+from src.templates import TEMPLATES_DIR, precompile_templates, render_template
+from auth.utils import create_verify_email_link
+
+from .common import report
+
+
+legacy_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+
+def legacy_request_path(user_id: int) -> str:
+    return legacy_env.get_template('verify_email.html').render(verify_link=create_verify_email_link(user_id))
+
+def enqueue_request_path(user_id: int) -> dict:
+    return {'verify_link': create_verify_email_link(user_id)}
+
+def worker_render(user_id: int) -> str:
+    return render_template('verify_email.html', {'verify_link': f'http://127.0.0.1:8000/auth/email-verify?token={user_id}'})
+
+def measure(func, iterations: int) -> float:
+    start = perf_counter()
+
+    for i in range(iterations):
+        func(i)
+
+    return round((perf_counter() - start) / iterations * 1_000_000, 2)
+
+def main(iterations: int) -> None:
+    precompile_templates()
+
+    report('verify_email_rendering', {
+        'iterations': iterations,
+        'request_render_in_api_us': measure(legacy_request_path, iterations),
+        'request_enqueue_only_us': measure(enqueue_request_path, iterations),
+        'worker_precompiled_render_us': measure(worker_render, iterations),
+    })
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    main(iterations)
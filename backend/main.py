@@ -1,8 +1,56 @@
+import asyncio
+
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
+from src.config import settings
+from src.database import warm_database_pool, check_replicas, monitor_replica_lag, dispose_database_engines
+from src.metrics import render_prometheus
+from src.instrumentation import TimingMiddleware
+from src.redis import create_redis_client, close_redis_client, warm_redis_pool
 from auth.routers import auth_router
+from auth.hashing import warm_hashing_executor, shutdown_hashing_executor
+from auth.utils import listen_blacklist_revocations, warm_jwt
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.redis = create_redis_client()
+
+    await asyncio.gather(
+        warm_database_pool(settings.DB_WARM_CONNECTIONS),
+        warm_redis_pool(app.state.redis, settings.REDIS_WARM_CONNECTIONS),
+        asyncio.to_thread(warm_hashing_executor),
+        check_replicas(),
+    )
+    warm_jwt()
+
+    background_tasks = [
+        asyncio.create_task(listen_blacklist_revocations(app.state.redis)),
+        asyncio.create_task(monitor_replica_lag()),
+    ]
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+
+    with suppress(asyncio.CancelledError):
+        await asyncio.gather(*background_tasks)
+
+    await close_redis_client(app.state.redis)
+    await dispose_database_engines()
+    shutdown_hashing_executor()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
+app.add_middleware(TimingMiddleware)
 
-app = FastAPI()
+app.include_router(auth_router)
 
-app.include_router(auth_router)
\ No newline at end of file
+if settings.METRICS_ENABLED:
+    @app.get('/metrics', include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(render_prometheus(), media_type='text/plain; version=0.0.4')
\ No newline at end of file
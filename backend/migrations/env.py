@@ -11,6 +11,7 @@ from src.database import BaseModel
 from src.config import settings
 
 from users.models import UserModel
+from outbox.models import OutboxMessageModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,37 @@
+"""partial index on unverified users
+
+Revision ID: d41e7a9c3f52
+Revises: 8c2d41f0a7b3
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7a9c3f52'
+down_revision: Union[str, None] = '8c2d41f0a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but doesn't block writes to users while it builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_unverified_created_at', 'users', ['created_at'],
+            unique=False,
+            postgresql_where=sa.text('is_verified = false'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_unverified_created_at', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from datetime import datetime
+
+from src.database import BaseModel
+
+
+class OutboxMessageModel(BaseModel):
+    __tablename__ = 'outbox_messages'
+
+    task_name: Mapped[str]
+    payload: Mapped[dict] = mapped_column(JSONB)
+
+    created_at: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
\ No newline at end of file
@@ -0,0 +1,12 @@
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.instrumentation import timed
+
+from .models import OutboxMessageModel
+
+
+@timed('outbox_add')
+async def add_outbox_message(task_name: str, payload: dict, db: AsyncSession) -> None:
+    ''' Queues a Celery task in the caller's transaction; it is published only after commit '''
+    await db.execute(insert(OutboxMessageModel).values(task_name=task_name, payload=payload))
\ No newline at end of file
@@ -0,0 +1,66 @@
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.celery import celery_app, run_async
+from src.database import async_session
+from src.instrumentation import timed
+
+from .models import OutboxMessageModel
+
+
+# Rows of these tasks are published as one batch task per OUTBOX_EMAIL_BATCH_SIZE rows
+BATCH_TASKS = {
+    'auth.tasks.send_template_email_task': 'auth.tasks.send_template_email_batch_task',
+}
+
+@timed('outbox_dispatch')
+async def dispatch_outbox_messages(batch_size: int, db: AsyncSession, *where) -> int:
+    ''' Publishes and deletes up to batch_size rows, optionally only those matching the where criteria '''
+    result = await db.execute(
+        select(OutboxMessageModel.id, OutboxMessageModel.task_name, OutboxMessageModel.payload)
+        .where(*where)
+        .order_by(OutboxMessageModel.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    messages = result.all()
+
+    if not messages:
+        return 0
+
+    batches: dict[str, list[dict]] = {}
+
+    with celery_app.producer_or_acquire() as producer:
+        for message in messages:
+            batch_task_name = BATCH_TASKS.get(message.task_name)
+
+            if batch_task_name is None:
+                celery_app.send_task(message.task_name, kwargs=message.payload, producer=producer)
+            else:
+                batches.setdefault(batch_task_name, []).append(message.payload)
+
+        for task_name, payloads in batches.items():
+            for i in range(0, len(payloads), settings.OUTBOX_EMAIL_BATCH_SIZE):
+                celery_app.send_task(task_name, args=[payloads[i:i + settings.OUTBOX_EMAIL_BATCH_SIZE]], producer=producer)
+
+    await db.execute(delete(OutboxMessageModel).where(OutboxMessageModel.id.in_([message.id for message in messages])))
+    await db.commit()
+
+    return len(messages)
+
+async def drain_outbox(*where) -> int:
+    dispatched_total = 0
+
+    while True:
+        async with async_session() as db:
+            dispatched = await dispatch_outbox_messages(settings.OUTBOX_BATCH_SIZE, db, *where)
+
+        dispatched_total += dispatched
+
+        if dispatched < settings.OUTBOX_BATCH_SIZE:
+            return dispatched_total
+
+@celery_app.task
+def dispatch_outbox_task() -> int:
+    return run_async(drain_outbox())
\ No newline at end of file
@@ -0,0 +1,49 @@
+import math
+import struct
+
+from hashlib import blake2b
+from typing import Iterable
+
+
+HEADER = struct.Struct('>QI')
+
+class BloomFilter:
+    ''' Fixed-size Bloom filter with double hashing over one blake2b digest '''
+    def __init__(self, size: int, hash_count: int, bits: bytearray | None = None) -> None:
+        self.size = size
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> 'BloomFilter':
+        size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(size / capacity * math.log(2)))
+
+        return cls(size, hash_count)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(self.size, self.hash_count))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        with open(path, 'rb') as file:
+            size, hash_count = HEADER.unpack(file.read(HEADER.size))
+            bits = bytearray(file.read())
+
+        return cls(size, hash_count, bits)
\ No newline at end of file
@@ -0,0 +1,45 @@
+from collections import OrderedDict
+from time import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    ''' Bounded LRU cache whose entries expire at an absolute unix timestamp '''
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+
+        if item is None:
+            return default
+
+        expires_at, value = item
+
+        if expires_at <= time():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -1,17 +1,66 @@
 import sys
+import asyncio
 
 from pathlib import Path
+from typing import Any, Coroutine
 
 from celery import Celery
+from kombu import Queue
 
 from .config import settings
 
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+EMAIL_TASKS = (
+    'auth.tasks.send_email_task',
+    'auth.tasks.send_template_email_task',
+    'auth.tasks.send_template_email_batch_task',
+)
+
 celery_app = Celery(
     'worker',
     broker=settings.RABBIT_MQ_URL,
 )
 
-celery_app.autodiscover_tasks(["auth"])
\ No newline at end of file
+celery_app.conf.update(
+    broker_transport_options={'confirm_publish': True},
+    task_queues=(Queue('default'), Queue('emails'), Queue('outbox')),
+    task_default_queue='default',
+    task_routes={
+        'auth.tasks.*': {'queue': 'emails'},
+        'outbox.tasks.*': {'queue': 'outbox'},
+    },
+    task_annotations={
+        name: {'rate_limit': settings.CELERY_EMAIL_RATE_LIMITS[settings.SMTP_HOST]}
+        for name in EMAIL_TASKS if settings.SMTP_HOST in settings.CELERY_EMAIL_RATE_LIMITS
+    },
+    task_compression=settings.CELERY_TASK_COMPRESSION,
+    task_ignore_result=True,
+    worker_pool=settings.CELERY_WORKER_POOL,
+    beat_schedule={
+        'dispatch-outbox': {
+            'task': 'outbox.tasks.dispatch_outbox_task',
+            'schedule': settings.OUTBOX_DISPATCH_INTERVAL_SECONDS,
+        },
+        'purge-unverified-users': {
+            'task': 'users.tasks.purge_unverified_users_task',
+            'schedule': settings.UNVERIFIED_USERS_PURGE_INTERVAL_SECONDS,
+        },
+    },
+    **settings.CELERY_WORKER_OPTIONS,
+)
+
+celery_app.autodiscover_tasks(["auth", "outbox", "users"])
+
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+def run_async(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    ''' Runs a coroutine on the worker process' persistent event loop, so pooled connections survive between tasks '''
+    global _worker_loop
+
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+
+    return _worker_loop.run_until_complete(coroutine)
\ No newline at end of file
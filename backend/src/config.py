@@ -1,39 +1,208 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+DB_PROFILES = {
+    'dev': {
+        'echo': True,
+        'pool_size': 5,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+        'pool_recycle': -1,
+        'pool_pre_ping': False,
+        'statement_cache_size': 100,
+    },
+    'prod': {
+        'echo': False,
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_timeout': 5,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+        'statement_cache_size': 500,
+    },
+}
+CELERY_PROFILES = {
+    'default': {
+        'worker_prefetch_multiplier': 4,
+        'task_acks_late': False,
+        'task_reject_on_worker_lost': False,
+    },
+    'throughput': {
+        'worker_prefetch_multiplier': 32,
+        'task_acks_late': False,
+        'task_reject_on_worker_lost': False,
+    },
+    'reliable': {
+        'worker_prefetch_multiplier': 1,
+        'task_acks_late': True,
+        'task_reject_on_worker_lost': True,
+    },
+}
+
 class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: str
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+
+    DB_PROFILE: Literal['dev', 'prod'] = 'dev'
+    DB_ECHO: bool | None = None
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: int | None = None
+    DB_POOL_RECYCLE: int | None = None
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int | None = None
+    DB_WARM_CONNECTIONS: int = 2
+    DB_REPLICA_HOSTS: list[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
     
     REDIS_HOST: str
     REDIS_PORT: str
+    REDIS_SOCKET_PATH: str | None = None
+    REDIS_SENTINELS: list[str] = []
+    REDIS_SENTINEL_MASTER: str = 'mymaster'
+    REDIS_PROTOCOL: Literal['2', '3'] = '3'
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_RETRIES: int = 3
+    REDIS_WARM_CONNECTIONS: int = 2
 
     RABBITMQ_DEFAULT_USER: str
     RABBITMQ_DEFAULT_PASS: str
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int
 
+    CELERY_PROFILE: Literal['default', 'throughput', 'reliable'] = 'default'
+    CELERY_WORKER_POOL: Literal['prefork', 'solo'] = 'prefork'
+    CELERY_PREFETCH_MULTIPLIER: int | None = None
+    CELERY_ACKS_LATE: bool | None = None
+    CELERY_TASK_COMPRESSION: Literal['gzip', 'bzip2', 'zlib'] | None = 'gzip'
+    CELERY_EMAIL_RATE_LIMITS: dict[str, str] = {}
+
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_DISPATCH_INTERVAL_SECONDS: float = 2.0
+    OUTBOX_EMAIL_BATCH_SIZE: int = 50
+
+    UNVERIFIED_USERS_RETENTION_HOURS: int = 168
+    UNVERIFIED_USERS_PURGE_INTERVAL_SECONDS: float = 3600.0
+    UNVERIFIED_USERS_PURGE_BATCH_SIZE: int = 1000
+    UNVERIFIED_USERS_PURGE_MAX_BATCHES: int = 100
+    UNVERIFIED_USERS_PURGE_BATCH_PAUSE_SECONDS: float = 0.1
+    UNVERIFIED_USERS_PURGE_DRY_RUN: bool = False
+
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    JWT_CACHE_SIZE: int = 10000
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    JWT_ACCEPT_LEGACY_TOKENS: bool = True
+    JWKS_MAX_AGE_SECONDS: int = 300
+
+    BLACKLIST_CACHE_SIZE: int = 100000
+    BLACKLIST_CHECK_LEGACY_KEYS: bool = True
+
+    USER_CACHE_TTL_SECONDS: int = 300
+    USER_CACHE_L1_SIZE: int = 10000
+    USER_CACHE_L1_TTL_SECONDS: int = 5
 
     SMTP_HOST: str
     SMTP_PORT: int
     SMTP_USER: str
     SMTP_PASSWORD: str
+    SMTP_FROM: str | None = None
+    SMTP_START_TLS: bool = True
+    SMTP_POOL_SIZE: int = 2
+    SMTP_POOL_IDLE_SECONDS: int = 60
 
     EMAIL_VERIFY_EXPIRE_MINUTES: int
+
+    TEMPLATES_CACHE_SIZE: int = 50
+    TEMPLATES_AUTO_RELOAD: bool = False
+    TEMPLATES_BYTECODE_DIR: str | None = None
+
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_LOGIN_PER_IP: int = 20
+    RATE_LIMIT_LOGIN_PER_EMAIL: int = 5
+    RATE_LIMIT_REGISTRATION_PER_IP: int = 5
+    RATE_LIMIT_LOCAL_CACHE_SIZE: int = 10000
+
+    PASSWORD_HASHER: Literal['bcrypt', 'argon2id'] = 'bcrypt'
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    PASSWORD_HASHING_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASHING_WORKERS: int = 4
+    PASSWORD_HASHING_QUEUE_SIZE: int = 32
+
+    METRICS_ENABLED: bool = True
+    METRICS_MAX_LABEL_SERIES: int = 200
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.01
+
+    PASSWORD_MIN_LENGTH: int = 8
+    PASSWORD_REQUIRE_LETTER: bool = True
+    PASSWORD_REQUIRE_DIGIT: bool = True
+    PASSWORD_REQUIRE_SPECIAL: bool = True
+    PASSWORD_SPECIAL_CHARACTERS: str = '@$!%*#?&_'
+    PASSWORD_BREACHED_FILTER_PATH: str | None = None
     
     @property
     def DATABASE_URL(self) -> str:
         return f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}'
+
+    @property
+    def DATABASE_REPLICA_URLS(self) -> list[str]:
+        ''' DB_REPLICA_HOSTS entries are host:port, optionally host:port/dbname, sharing the primary's credentials '''
+        urls = []
+
+        for replica in self.DB_REPLICA_HOSTS:
+            address, _, name = replica.partition('/')
+            urls.append(f'postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{address}/{name or self.DB_NAME}')
+
+        return urls
+
+    @property
+    def DATABASE_ENGINE_OPTIONS(self) -> dict:
+        ''' DB_PROFILE defaults overridden by any explicitly set DB_* value '''
+        overrides = {
+            'echo': self.DB_ECHO,
+            'pool_size': self.DB_POOL_SIZE,
+            'max_overflow': self.DB_MAX_OVERFLOW,
+            'pool_timeout': self.DB_POOL_TIMEOUT,
+            'pool_recycle': self.DB_POOL_RECYCLE,
+            'pool_pre_ping': self.DB_POOL_PRE_PING,
+            'statement_cache_size': self.DB_STATEMENT_CACHE_SIZE,
+        }
+
+        return DB_PROFILES[self.DB_PROFILE] | {key: value for key, value in overrides.items() if value is not None}
     
+    @property
+    def CELERY_WORKER_OPTIONS(self) -> dict:
+        ''' CELERY_PROFILE defaults overridden by any explicitly set CELERY_* value '''
+        overrides = {
+            'worker_prefetch_multiplier': self.CELERY_PREFETCH_MULTIPLIER,
+            'task_acks_late': self.CELERY_ACKS_LATE,
+        }
+
+        return CELERY_PROFILES[self.CELERY_PROFILE] | {key: value for key, value in overrides.items() if value is not None}
+
     @property
     def REDIS_URL(self) -> str:
+        if self.REDIS_SOCKET_PATH:
+            return f"unix://{self.REDIS_SOCKET_PATH}"
+
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
     
     @property
@@ -1,20 +1,141 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+import asyncio
+
+from itertools import count
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import settings
+from .metrics import Counter, Gauge, Histogram
 
 
-async_engine = create_async_engine(
-    url=settings.DATABASE_URL,
-    echo=True, # Убрать при деплое!
-)
+db_pool_wait_seconds = Histogram('db_pool_wait_seconds', 'Time spent waiting for a connection from the DB pool')
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    ''' Queue pool that records how long each checkout waited '''
+    def _do_get(self):
+        start = perf_counter()
+
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(perf_counter() - start)
+
+db_replica_reads_total = Counter('db_replica_reads_total', 'Session binds for read-only statements served by a replica')
+db_primary_reads_total = Counter('db_primary_reads_total', 'Session binds for read-only statements sent to the primary because no replica was healthy')
+
+# NULL when the WAL receiver isn't streaming: replay then catches up with the last WAL received and
+# looks lag-free while the replica falls behind. status is NULL for roles without pg_read_all_stats,
+# so for them a running receiver process has to do
+REPLICA_LAG_QUERY = text('''
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming' OR status IS NULL) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+''')
+
+def create_database_engine(options: dict, url: str | None = None) -> AsyncEngine:
+    options = options.copy()
+    statement_cache_size = options.pop('statement_cache_size')
+
+    return create_async_engine(
+        url=url or settings.DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args={'prepared_statement_cache_size': statement_cache_size},
+        **options,
+    )
+
+async_engine = create_database_engine(settings.DATABASE_ENGINE_OPTIONS)
+
+replica_engines = [create_database_engine(settings.DATABASE_ENGINE_OPTIONS, url) for url in settings.DATABASE_REPLICA_URLS]
+
+# Filled by monitor_replica_lag, so processes that don't run it (Celery workers, scripts) read from the primary
+healthy_replicas: list[AsyncEngine] = []
+replica_counter = count()
+
+def is_read_only(clause) -> bool:
+    ''' Plain SELECTs only: DML, SELECT ... FOR UPDATE, text() and raw connection access stay on the primary '''
+    clause = getattr(clause, '_resolved', clause)
+
+    return getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None
+
+class RoutingSession(Session):
+    ''' Sends read-only statements to one healthy replica per session; writes, everything after them and bind_arguments={'primary': True} go to the primary '''
+    def get_bind(self, mapper=None, clause=None, primary=False, **kwargs):
+        if primary or self.info.get('primary') or self._flushing or not is_read_only(clause):
+            self.info['primary'] = True
+            return async_engine.sync_engine
+
+        replica = self.info.get('replica')
 
+        if replica is None:
+            if not healthy_replicas:
+                db_primary_reads_total.inc()
+                return async_engine.sync_engine
+
+            replica = healthy_replicas[next(replica_counter) % len(healthy_replicas)]
+            self.info['replica'] = replica
+
+        db_replica_reads_total.inc()
+
+        return replica.sync_engine
+
+# AsyncSession checks a connection out on the first statement and returns it on commit, rollback or close
 async_session = async_sessionmaker(
     bind=async_engine,
+    sync_session_class=RoutingSession if replica_engines else Session,
     expire_on_commit=False,
     autoflush=False,
 )
 
+async def warm_database_pool(connections: int) -> None:
+    ''' Opens connections up front so the first requests don't pay for TCP, TLS and auth '''
+    async def open_connection() -> None:
+        async with async_engine.connect() as connection:
+            await connection.execute(text('SELECT 1'))
+
+    await asyncio.gather(*(open_connection() for _ in range(connections)))
+
+async def get_replica_lag(engine: AsyncEngine) -> float | None:
+    ''' Replay lag in seconds, None when the replica isn't receiving WAL '''
+    async with engine.connect() as connection:
+        lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar_one()
+
+    return None if lag is None else float(lag)
+
+async def check_replicas() -> None:
+    ''' Keeps replicas that answer within the check interval, stream WAL and lag at most DB_REPLICA_MAX_LAG_SECONDS '''
+    healthy = []
+
+    for engine in replica_engines:
+        try:
+            lag = await asyncio.wait_for(get_replica_lag(engine), settings.DB_REPLICA_CHECK_INTERVAL_SECONDS)
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+            continue
+
+        if lag is not None and lag <= settings.DB_REPLICA_MAX_LAG_SECONDS:
+            healthy.append(engine)
+
+    healthy_replicas[:] = healthy
+
+async def monitor_replica_lag() -> None:
+    while True:
+        await asyncio.sleep(settings.DB_REPLICA_CHECK_INTERVAL_SECONDS)
+        await check_replicas()
+
+async def dispose_database_engines() -> None:
+    await asyncio.gather(async_engine.dispose(), *(engine.dispose() for engine in replica_engines))
+
+Gauge('db_replicas_healthy', 'Read replicas currently eligible for read-only statements', lambda: len(healthy_replicas))
+Gauge('db_pool_checked_out', 'DB connections currently checked out of the pool', lambda: async_engine.pool.checkedout())
+Gauge('db_pool_overflow', 'DB connections open beyond pool_size', lambda: max(async_engine.pool.overflow(), 0))
+
 class BaseModel(DeclarativeBase):
     ''' Basic SQLAlchemy model with ID primary key field '''
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
\ No newline at end of file
@@ -1,14 +1,188 @@
+from fastapi import Depends, HTTPException, Request, status
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from dataclasses import dataclass
+from math import ceil
+from time import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from auth.utils import verify_jwt_token
+from auth.exceptions import INVALID_JWT_TOKEN, MISSING_ACCESS_TOKEN, INSUFFICIENT_PERMISSIONS, USER_ACCOUNT_IS_MISSING, USER_ACCOUNT_IS_INACTIVE
+from users.cache import UserAuthData, get_user_auth
+from users.models import UserRoleEnum
 
+from .config import settings
+from .cache import TTLCache
 from .database import async_session
-from .redis import redis_client
+from .metrics import Counter
+
+
+SLIDING_WINDOW_SCRIPT = '''
+local now_seconds, now_microseconds = unpack(redis.call('TIME'))
+local now = now_seconds * 1000 + math.floor(now_microseconds / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
 
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return 0
+end
+
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+
+return tonumber(oldest[2]) + window - now
+'''
+
+local_rate_limit_buckets = TTLCache(maxsize=settings.RATE_LIMIT_LOCAL_CACHE_SIZE)
+rate_limited_total = Counter('rate_limited_total', 'Requests rejected with 429 by a rate limiter')
+rate_limit_fallback_total = Counter('rate_limit_fallback_total', 'Rate limit checks served by the local bucket because Redis was unavailable')
 
 async def get_db() -> AsyncSession:
+    ''' Reads may go to a replica, so don't use it to read what this request or the previous one just wrote '''
     async with async_session() as session:
         yield session
 
-async def get_redis() -> Redis:
-    yield redis_client
\ No newline at end of file
+async def get_primary_db() -> AsyncSession:
+    ''' Session pinned to the primary for read-then-write flows '''
+    async with async_session(info={'primary': True}) as session:
+        yield session
+
+async def get_redis(request: Request) -> Redis:
+    yield request.app.state.redis
+
+async def client_ip_key(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+async def email_key(request: Request) -> str | None:
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+
+    email = body.get('email') if isinstance(body, dict) else None
+
+    return email.strip().lower() if isinstance(email, str) else None
+
+class RateLimiter:
+    ''' Sliding-window limit per key in Redis with an in-process token bucket fallback '''
+    def __init__(self, scope: str, limit: int, window_seconds: int, key_func: Callable[[Request], Awaitable[str | None]]) -> None:
+        self.scope = scope
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.key_func = key_func
+
+    async def __call__(self, request: Request, redis: Redis = Depends(get_redis)) -> None:
+        identifier = await self.key_func(request)
+
+        if identifier is None:
+            return
+
+        key = f'ratelimit:{self.scope}:{identifier}'
+
+        try:
+            sliding_window = redis.register_script(SLIDING_WINDOW_SCRIPT)
+            retry_after_ms = await sliding_window(keys=[key], args=[self.window_seconds * 1000, self.limit, uuid4().hex])
+        except RedisError:
+            rate_limit_fallback_total.inc()
+            retry_after_ms = self.consume_local_bucket(key)
+
+        if retry_after_ms > 0:
+            rate_limited_total.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail='Слишком много запросов, повторите попытку позже!',
+                headers={'Retry-After': str(ceil(retry_after_ms / 1000))},
+            )
+
+    def consume_local_bucket(self, key: str) -> int:
+        now = time()
+        tokens, updated_at = local_rate_limit_buckets.get(key, (self.limit, now))
+        tokens = min(self.limit, tokens + (now - updated_at) * self.limit / self.window_seconds)
+
+        if tokens < 1:
+            return ceil((1 - tokens) * self.window_seconds / self.limit * 1000)
+
+        local_rate_limit_buckets.set(key, (tokens - 1, now), now + self.window_seconds)
+
+        return 0
+
+@dataclass(slots=True, frozen=True)
+class CurrentUser:
+    ''' User identity taken from the claims of a validated access token '''
+    id: int
+    role: UserRoleEnum
+
+def get_access_token(request: Request) -> str | None:
+    authorization = request.headers.get('authorization')
+
+    if authorization:
+        scheme, _, token = authorization.partition(' ')
+
+        if scheme.lower() == 'bearer' and token:
+            return token
+
+    return request.cookies.get('access_token')
+
+async def get_token_payload(request: Request) -> dict:
+    ''' Decoded once per request and kept on request.state, also for callers outside the dependency graph '''
+    payload = getattr(request.state, 'token_payload', None)
+
+    if payload is not None:
+        return payload
+
+    token = get_access_token(request)
+
+    if not token:
+        raise MISSING_ACCESS_TOKEN
+
+    payload = verify_jwt_token(token)
+
+    # Refresh tokens carry no role claim and must not authenticate requests
+    if 'sub' not in payload or 'role' not in payload:
+        raise INVALID_JWT_TOKEN
+
+    request.state.token_payload = payload
+
+    return payload
+
+async def get_current_user(payload: dict = Depends(get_token_payload)) -> CurrentUser:
+    ''' Trusts the sub and role claims, no database or Redis round trip '''
+    try:
+        return CurrentUser(int(payload['sub']), UserRoleEnum(payload['role']))
+    except ValueError:
+        raise INVALID_JWT_TOKEN
+
+async def get_fresh_current_user(
+    user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+) -> UserAuthData:
+    ''' Current role and account state for routes that can't act on claims up to ACCESS_TOKEN_EXPIRE_MINUTES old '''
+    fresh_user = await get_user_auth(user.id, db, redis)
+
+    if fresh_user is None:
+        raise USER_ACCOUNT_IS_MISSING
+
+    if not fresh_user.is_active:
+        raise USER_ACCOUNT_IS_INACTIVE
+
+    return fresh_user
+
+def require_roles(*roles: UserRoleEnum) -> Callable[[CurrentUser], Awaitable[CurrentUser]]:
+    allowed_roles = frozenset(roles)
+
+    async def check_roles(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        if user.role not in allowed_roles:
+            raise INSUFFICIENT_PERMISSIONS
+
+        return user
+
+    return check_roles
\ No newline at end of file
@@ -0,0 +1,113 @@
+import asyncio
+
+from contextvars import ContextVar
+from functools import wraps
+from random import random
+from time import perf_counter
+from typing import Any, Callable
+
+from .config import settings
+from .metrics import LabeledHistogram
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+
+http_request_seconds = LabeledHistogram(
+    'http_request_seconds', 'HTTP request duration by method, route template and status class',
+    ('method', 'route', 'status'), settings.METRICS_MAX_LABEL_SERIES,
+)
+stage_seconds = LabeledHistogram('stage_seconds', 'Time spent in one stage of request handling', ('stage',), settings.METRICS_MAX_LABEL_SERIES)
+
+tracer = trace.get_tracer('backend') if trace is not None and settings.TRACING_ENABLED else None
+
+# Sampling is decided once per request, so a sampled trace always has all of its stage spans
+trace_sampled: ContextVar[bool] = ContextVar('trace_sampled', default=False)
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    ''' Records the duration of a sync or async function under a fixed stage label, plus a span in sampled requests '''
+    def decorator(func: Callable) -> Callable:
+        if not settings.METRICS_ENABLED and tracer is None:
+            return func
+
+        histogram = stage_seconds.labels(stage)
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = perf_counter()
+
+                try:
+                    if trace_sampled.get():
+                        with tracer.start_as_current_span(stage):
+                            return await func(*args, **kwargs)
+
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(perf_counter() - start)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+
+            try:
+                if trace_sampled.get():
+                    with tracer.start_as_current_span(stage):
+                        return func(*args, **kwargs)
+
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+class TimingMiddleware:
+    ''' ASGI middleware timing each HTTP request, labelled by route template so paths can't blow up cardinality '''
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+
+            await send(message)
+
+        sampled = tracer is not None and random() < settings.TRACING_SAMPLE_RATE
+        token = trace_sampled.set(sampled)
+        start = perf_counter()
+
+        try:
+            if sampled:
+                with tracer.start_as_current_span(f'{scope["method"]} request', kind=trace.SpanKind.SERVER) as span:
+                    await self.app(scope, receive, send_wrapper)
+
+                    route = get_route_template(scope)
+                    span.update_name(f'{scope["method"]} {route}')
+                    span.set_attribute('http.route', route)
+                    span.set_attribute('http.response.status_code', status_code)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            trace_sampled.reset(token)
+
+            if settings.METRICS_ENABLED:
+                http_request_seconds.labels(scope['method'], get_route_template(scope), f'{status_code // 100}xx').observe(perf_counter() - start)
+
+def get_route_template(scope: dict) -> str:
+    route = scope.get('route')
+
+    return getattr(route, 'path', 'unmatched')
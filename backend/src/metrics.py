@@ -0,0 +1,131 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OVERFLOW_LABEL = 'other'
+
+registry: dict[str, 'Counter | Gauge | Histogram | LabeledHistogram'] = {}
+
+class Counter:
+    ''' Monotonic in-process counter '''
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self.value = 0
+        self._lock = Lock()
+
+        registry[name] = self
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+class Gauge:
+    ''' Point-in-time value read from a callback when metrics are collected '''
+    def __init__(self, name: str, description: str, func: Callable[[], float]) -> None:
+        self.name = name
+        self.description = description
+        self._func = func
+
+        registry[name] = self
+
+    @property
+    def value(self) -> float:
+        return self._func()
+
+class Histogram:
+    ''' Cumulative bucket histogram of observed durations in seconds '''
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS, register: bool = True) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = Lock()
+
+        if register:
+            registry[name] = self
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+class LabeledHistogram:
+    ''' Histogram per label combination, past max_series new combinations share one overflow series '''
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...], max_series: int, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.max_series = max_series
+        self.buckets = buckets
+        self.children: dict[tuple[str, ...], Histogram] = {}
+        self._lock = Lock()
+
+        registry[name] = self
+
+    def labels(self, *values: str) -> Histogram:
+        child = self.children.get(values)
+
+        if child is not None:
+            return child
+
+        with self._lock:
+            if values not in self.children and len(self.children) >= self.max_series:
+                values = (OVERFLOW_LABEL,) * len(self.label_names)
+
+            return self.children.setdefault(values, Histogram(self.name, self.description, self.buckets, register=False))
+
+def escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + '}'
+
+def render_histogram(name: str, histogram: Histogram, labels: dict[str, str]) -> list[str]:
+    lines = []
+    cumulative = 0
+
+    for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{format_labels(labels | {"le": repr(bound)})} {cumulative}')
+
+    lines.append(f'{name}_bucket{format_labels(labels | {"le": "+Inf"})} {histogram.count}')
+    lines.append(f'{name}_sum{format_labels(labels)} {histogram.sum}')
+    lines.append(f'{name}_count{format_labels(labels)} {histogram.count}')
+
+    return lines
+
+def render_prometheus() -> str:
+    ''' Prometheus text exposition format 0.0.4 of every registered metric '''
+    lines = []
+
+    for name, metric in list(registry.items()):
+        lines.append(f'# HELP {name} {metric.description}')
+
+        if isinstance(metric, Counter):
+            lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name} {metric.value}')
+        elif isinstance(metric, Gauge):
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {metric.value}')
+        elif isinstance(metric, Histogram):
+            lines.append(f'# TYPE {name} histogram')
+            lines.extend(render_histogram(name, metric, {}))
+        else:
+            lines.append(f'# TYPE {name} histogram')
+
+            for values, child in list(metric.children.items()):
+                lines.extend(render_histogram(name, child, dict(zip(metric.label_names, values))))
+
+    return '\n'.join(lines) + '\n'
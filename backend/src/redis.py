@@ -1,7 +1,72 @@
-from redis.asyncio import Redis, ConnectionPool
+import asyncio
+
+from time import perf_counter
+
+from redis.asyncio import Redis, BlockingConnectionPool
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel, SentinelConnectionPool
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
 
 from .config import settings
+from .metrics import Gauge, Histogram
+
+
+redis_command_seconds = Histogram('redis_command_seconds', 'Redis command round trip time, including pool wait')
+
+class InstrumentedRedis(Redis):
+    ''' Redis client that records the latency of every command '''
+    async def execute_command(self, *args, **options):
+        start = perf_counter()
+
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            redis_command_seconds.observe(perf_counter() - start)
+
+class BlockingSentinelConnectionPool(SentinelConnectionPool, BlockingConnectionPool):
+    ''' Sentinel-managed pool that waits up to timeout for a free connection instead of failing at once '''
+
+def create_redis_client() -> Redis:
+    connection_options = {
+        'protocol': int(settings.REDIS_PROTOCOL),
+        'socket_timeout': settings.REDIS_SOCKET_TIMEOUT,
+        'socket_connect_timeout': settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        'health_check_interval': settings.REDIS_HEALTH_CHECK_INTERVAL,
+        'retry': Retry(ExponentialBackoff(cap=1, base=0.05), settings.REDIS_RETRIES),
+        'retry_on_error': [ConnectionError, TimeoutError],
+    }
+
+    if settings.REDIS_SENTINELS:
+        sentinel = Sentinel(
+            [(host, int(port)) for host, port in (address.rsplit(':', 1) for address in settings.REDIS_SENTINELS)],
+            sentinel_kwargs={'socket_timeout': settings.REDIS_SOCKET_TIMEOUT},
+        )
+        client = sentinel.master_for(
+            settings.REDIS_SENTINEL_MASTER,
+            redis_class=InstrumentedRedis,
+            connection_pool_class=BlockingSentinelConnectionPool,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            **connection_options,
+        )
+    else:
+        pool = BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            **connection_options,
+        )
+        client = InstrumentedRedis(connection_pool=pool)
+
+    Gauge('redis_pool_in_use', 'Redis connections currently checked out of the pool', lambda: len(client.connection_pool._in_use_connections))
+    Gauge('redis_pool_max_connections', 'Redis pool size limit', lambda: client.connection_pool.max_connections)
+
+    return client
 
+async def warm_redis_pool(client: Redis, connections: int) -> None:
+    await asyncio.gather(*(client.ping() for _ in range(connections)))
 
-redis_pool = ConnectionPool.from_url(settings.REDIS_URL, max_connections=10)
-redis_client = Redis(connection_pool=redis_pool)
\ No newline at end of file
+async def close_redis_client(client: Redis) -> None:
+    await client.aclose()
+    await client.connection_pool.disconnect()
\ No newline at end of file
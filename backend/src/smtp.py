@@ -0,0 +1,70 @@
+import asyncio
+import aiosmtplib
+
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator
+
+from .config import settings
+
+
+class SMTPConnectionPool:
+    ''' Authenticated SMTP sessions kept open and reused across tasks of one worker process '''
+    def __init__(self, size: int, idle_timeout: float) -> None:
+        self.idle_timeout = idle_timeout
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=settings.SMTP_START_TLS,
+            username=settings.SMTP_USER or None,
+            password=settings.SMTP_PASSWORD or None,
+        )
+        await client.connect()
+
+        return client
+
+    async def _close(self, client: aiosmtplib.SMTP) -> None:
+        try:
+            await client.quit()
+        except aiosmtplib.SMTPException:
+            client.close()
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client, released_at = self._idle.pop()
+
+            if client.is_connected and monotonic() - released_at < self.idle_timeout:
+                # is_connected is local state only; a NOOP finds sessions the server has already timed out
+                try:
+                    await client.noop()
+                    return client
+                except aiosmtplib.SMTPException:
+                    pass
+
+            await self._close(client)
+
+        return await self._connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._semaphore:
+            client = await self._acquire()
+
+            try:
+                yield client
+            except BaseException:
+                await self._close(client)
+                raise
+
+            self._idle.append((client, monotonic()))
+
+    async def close(self) -> None:
+        while self._idle:
+            client, _ = self._idle.pop()
+            await self._close(client)
+
+smtp_pool = SMTPConnectionPool(size=settings.SMTP_POOL_SIZE, idle_timeout=settings.SMTP_POOL_IDLE_SECONDS)
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+from .config import settings
+
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATES_BYTECODE_DIR),
+    cache_size=settings.TEMPLATES_CACHE_SIZE,
+    auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+)
+
+def precompile_templates() -> None:
+    for name in env.list_templates():
+        env.get_template(name)
+
+def render_template(name: str, context: dict) -> str:
+    return env.get_template(name).render(**context)
\ No newline at end of file
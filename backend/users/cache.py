@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from time import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from redis.asyncio import Redis
+
+from src.config import settings
+from src.cache import TTLCache
+from src.metrics import Counter
+
+from .models import UserRoleEnum
+from .queries import get_user_auth_by_id
+
+
+@dataclass(slots=True, frozen=True)
+class UserAuthData:
+    ''' Compact projection of the user fields needed for auth decisions '''
+    id: int
+    role: UserRoleEnum
+    is_active: bool
+    is_verified: bool
+
+    def dump(self) -> str:
+        return f'{self.role.value}:{int(self.is_active)}:{int(self.is_verified)}'
+
+    @classmethod
+    def load(cls, id: int, value: bytes) -> 'UserAuthData':
+        role, is_active, is_verified = value.decode().split(':')
+
+        return cls(id, UserRoleEnum(role), is_active == '1', is_verified == '1')
+
+user_auth_cache = TTLCache(maxsize=settings.USER_CACHE_L1_SIZE)
+user_auth_cache_hits_total = Counter('user_auth_cache_hits_total', 'User auth lookups served from the in-process or Redis cache')
+user_auth_cache_misses_total = Counter('user_auth_cache_misses_total', 'User auth lookups that went to the database')
+
+def get_user_auth_key(user_id: int) -> str:
+    return f'user:auth:{user_id}'
+
+async def get_user_auth(user_id: int, db: AsyncSession, redis: Redis) -> UserAuthData | None:
+    user = user_auth_cache.get(user_id)
+
+    if user is not None:
+        user_auth_cache_hits_total.inc()
+        return user
+
+    cached_user = await redis.get(get_user_auth_key(user_id))
+
+    if cached_user is not None:
+        user_auth_cache_hits_total.inc()
+        user = UserAuthData.load(user_id, cached_user)
+        user_auth_cache.set(user_id, user, time() + settings.USER_CACHE_L1_TTL_SECONDS)
+        return user
+
+    user_auth_cache_misses_total.inc()
+
+    row = await get_user_auth_by_id(user_id, db)
+
+    if row is None:
+        return None
+
+    user = UserAuthData(*row)
+
+    await redis.set(get_user_auth_key(user_id), user.dump(), ex=settings.USER_CACHE_TTL_SECONDS)
+    user_auth_cache.set(user_id, user, time() + settings.USER_CACHE_L1_TTL_SECONDS)
+
+    return user
+
+async def invalidate_user_auth(user_id: int, redis: Redis) -> None:
+    user_auth_cache.pop(user_id)
+    await redis.delete(get_user_auth_key(user_id))
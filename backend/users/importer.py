@@ -0,0 +1,100 @@
+''' Bulk import of existing user bases into the users table via COPY.
+
+Run from backend/: python -m users.importer users.csv [batch_size]
+The CSV needs a header with email and password (an existing bcrypt or argon2id
+hash), optionally first_name, last_name, phone_number and is_verified. Rows
+whose email or phone number already exist are skipped. Imported hashes are
+upgraded to the current PASSWORD_HASHER on the user's first login.
+
+is_verified defaults to true when the column is missing or empty. The importer
+sends no verification emails, so a row imported with is_verified=false can never
+verify: it can't log in, and the unverified users purge deletes it
+UNVERIFIED_USERS_RETENTION_HOURS after the import. Only mark rows false on purpose.
+'''
+import asyncio
+import csv
+import sys
+
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_engine, async_session
+
+
+IMPORT_COLUMNS = ('email', 'password', 'first_name', 'last_name', 'phone_number', 'is_verified')
+
+CREATE_IMPORT_TABLE = text('''
+    CREATE TEMP TABLE users_import (
+        email varchar NOT NULL,
+        password varchar NOT NULL,
+        first_name varchar,
+        last_name varchar,
+        phone_number varchar(20),
+        is_verified boolean NOT NULL
+    ) ON COMMIT DROP
+''')
+
+INSERT_FROM_IMPORT_TABLE = text('''
+    INSERT INTO users (email, password, first_name, last_name, phone_number, role, is_active, is_verified, is_mailing)
+    SELECT email, password, first_name, last_name, phone_number, 'USER', true, is_verified, true
+    FROM users_import
+    ON CONFLICT DO NOTHING
+''')
+
+async def import_users(records: Iterable[tuple], db: AsyncSession) -> int:
+    ''' Copies (email, password, first_name, last_name, phone_number, is_verified) tuples, returns inserted count '''
+    await db.execute(CREATE_IMPORT_TABLE)
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table('users_import', records=records, columns=IMPORT_COLUMNS)
+
+    result = await db.execute(INSERT_FROM_IMPORT_TABLE)
+
+    return result.rowcount
+
+def read_csv_records(path: str) -> Iterable[tuple]:
+    with open(path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            yield (
+                row['email'].strip(),
+                row['password'],
+                row.get('first_name') or None,
+                row.get('last_name') or None,
+                row.get('phone_number') or None,
+                (row.get('is_verified') or 'true').lower() in ('1', 'true', 'yes'),
+            )
+
+async def main(path: str, batch_size: int) -> None:
+    batch: list[tuple] = []
+    imported = 0
+    total = 0
+
+    async def flush() -> int:
+        async with async_session() as db:
+            inserted = await import_users(batch, db)
+            await db.commit()
+
+        return inserted
+
+    for record in read_csv_records(path):
+        batch.append(record)
+        total += 1
+
+        if len(batch) >= batch_size:
+            imported += await flush()
+            batch.clear()
+
+    if batch:
+        imported += await flush()
+
+    await async_engine.dispose()
+
+    print(f'Imported {imported} of {total} users, skipped {total - imported} duplicates')
+
+if __name__ == '__main__':
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    asyncio.run(main(sys.argv[1], batch_size))
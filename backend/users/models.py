@@ -1,4 +1,4 @@
-from sqlalchemy import text, String
+from sqlalchemy import Index, text, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from enum import Enum
@@ -14,6 +14,9 @@ class UserRoleEnum(str, Enum):
 
 class UserModel(BaseModel):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_unverified_created_at', 'created_at', postgresql_where=text('is_verified = false')),
+    )
 
     email: Mapped[str] = mapped_column(unique=True, index=True)
     password: Mapped[str]
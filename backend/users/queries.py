@@ -0,0 +1,45 @@
+from sqlalchemy import Row, lambda_stmt, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.instrumentation import timed
+
+from .models import UserModel
+
+
+@timed('db_create_user')
+async def create_user(values: dict, db: AsyncSession) -> int | None:
+    ''' Inserts a user in one round trip, None if the email is already registered '''
+    result = await db.execute(
+        insert(UserModel).values(**values).on_conflict_do_nothing(index_elements=[UserModel.email]).returning(UserModel.id)
+    )
+
+    return result.scalar_one_or_none()
+
+@timed('db_get_user_credentials')
+async def get_user_credentials_by_email(email: str, db: AsyncSession) -> Row | None:
+    ''' id, password, role, is_active, is_verified for login '''
+    result = await db.execute(lambda_stmt(
+        lambda: select(UserModel.id, UserModel.password, UserModel.role, UserModel.is_active, UserModel.is_verified).where(UserModel.email == email)
+    ))
+
+    return result.one_or_none()
+
+@timed('db_get_user_auth')
+async def get_user_auth_by_id(user_id: int, db: AsyncSession) -> Row | None:
+    ''' id, role, is_active, is_verified for refresh and email verification; always read on the primary, since it fills the user auth cache '''
+    result = await db.execute(lambda_stmt(
+        lambda: select(UserModel.id, UserModel.role, UserModel.is_active, UserModel.is_verified).where(UserModel.id == user_id)
+    ), bind_arguments={'primary': True})
+
+    return result.one_or_none()
+
+async def update_user_password(user_id: int, password: str, db: AsyncSession) -> None:
+    await db.execute(lambda_stmt(
+        lambda: update(UserModel).where(UserModel.id == user_id).values(password=password)
+    ))
+
+async def set_user_verified(user_id: int, db: AsyncSession) -> None:
+    await db.execute(lambda_stmt(
+        lambda: update(UserModel).where(UserModel.id == user_id).values(is_verified=True)
+    ))
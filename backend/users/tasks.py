@@ -0,0 +1,91 @@
+import asyncio
+
+from datetime import datetime, timezone, timedelta
+from time import perf_counter
+
+from sqlalchemy import Select, delete, false, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.celery import celery_app, run_async
+from src.database import async_session
+from src.metrics import Counter, Histogram
+
+from .models import UserModel
+
+
+unverified_users_purged_total = Counter('unverified_users_purged_total', 'Expired unverified users deleted by the purge task')
+unverified_users_purge_candidates_total = Counter('unverified_users_purge_candidates_total', 'Expired unverified users found by dry runs of the purge task')
+unverified_users_purge_batch_seconds = Histogram('unverified_users_purge_batch_seconds', 'Duration of one purge batch transaction')
+
+def select_expired_unverified_users(cutoff: datetime, after: tuple[datetime, int] | None, batch_size: int) -> Select:
+    ''' Keyset page over ix_users_unverified_created_at, so batches don't rescan index entries of deleted rows '''
+    # == false() rather than IS false, the planner only matches the partial index predicate literally
+    stmt = select(UserModel.created_at, UserModel.id).where(UserModel.is_verified == false(), UserModel.created_at < cutoff)
+
+    if after is not None:
+        stmt = stmt.where(tuple_(UserModel.created_at, UserModel.id) > tuple_(*after))
+
+    return stmt.order_by(UserModel.created_at, UserModel.id).limit(batch_size)
+
+async def purge_batch(cutoff: datetime, after: tuple[datetime, int] | None, batch_size: int, dry_run: bool, db: AsyncSession) -> list[tuple[datetime, int]]:
+    ''' One short transaction: (created_at, id) of the rows deleted, or found on a dry run '''
+    batch = select_expired_unverified_users(cutoff, after, batch_size)
+
+    if dry_run:
+        return [tuple(row) for row in (await db.execute(batch)).all()]
+
+    # Rows being verified or otherwise locked right now are skipped instead of waited for
+    locked_ids = batch.with_only_columns(UserModel.id).with_for_update(skip_locked=True)
+    result = await db.execute(
+        delete(UserModel)
+        .where(UserModel.id.in_(locked_ids), UserModel.is_verified == false())
+        .returning(UserModel.created_at, UserModel.id)
+    )
+    rows = [tuple(row) for row in result.all()]
+    await db.commit()
+
+    return rows
+
+async def purge_unverified_users(cutoff: datetime, batch_size: int, max_batches: int, dry_run: bool, pause_seconds: float = 0.0) -> dict:
+    ''' Deletes unverified users created before cutoff in at most max_batches batches, pausing between them to spread WAL; rows imported with is_verified=false are included '''
+    after = None
+    total = 0
+    batches = 0
+
+    while batches < max_batches:
+        start = perf_counter()
+
+        async with async_session() as db:
+            rows = await purge_batch(cutoff, after, batch_size, dry_run, db)
+
+        unverified_users_purge_batch_seconds.observe(perf_counter() - start)
+        batches += 1
+        total += len(rows)
+
+        if rows:
+            after = max(rows)
+
+        if len(rows) < batch_size:
+            break
+
+        await asyncio.sleep(pause_seconds)
+
+    if dry_run:
+        unverified_users_purge_candidates_total.inc(total)
+    else:
+        unverified_users_purged_total.inc(total)
+
+    return {'dry_run': dry_run, 'users': total, 'batches': batches, 'cutoff': cutoff.isoformat()}
+
+@celery_app.task
+def purge_unverified_users_task(dry_run: bool | None = None) -> dict:
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=settings.UNVERIFIED_USERS_RETENTION_HOURS)
+
+    return run_async(purge_unverified_users(
+        cutoff,
+        settings.UNVERIFIED_USERS_PURGE_BATCH_SIZE,
+        settings.UNVERIFIED_USERS_PURGE_MAX_BATCHES,
+        settings.UNVERIFIED_USERS_PURGE_DRY_RUN if dry_run is None else dry_run,
+        settings.UNVERIFIED_USERS_PURGE_BATCH_PAUSE_SECONDS,
+    ))